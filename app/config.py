@@ -24,4 +24,20 @@ class ServerSettings(BaseModel):
 
 # Global settings instances
 tournament_settings = TournamentSettings()
-server_settings = ServerSettings()
\ No newline at end of file
+server_settings = ServerSettings()
+
+# Startup banner printed by run.py, formatted once from the settings above
+BANNER = f"""
+╔══════════════════════════════════════════════════════════════╗
+║                 🃏 POKER BOT TOURNAMENT 🃏                    ║
+╠══════════════════════════════════════════════════════════════╣
+║  Server starting on http://{server_settings.host}:{server_settings.port}                    ║
+║                                                              ║
+║  Endpoints:                                                  ║
+║    • Viewer:  http://localhost:{server_settings.port}/static/viewer.html    ║
+║    • Admin:   http://localhost:{server_settings.port}/static/admin.html     ║
+║    • API Docs: http://localhost:{server_settings.port}/docs                  ║
+║                                                              ║
+║  Admin Password: {server_settings.admin_password}                                 ║
+╚══════════════════════════════════════════════════════════════╝
+"""
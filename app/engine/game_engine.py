@@ -1,15 +1,15 @@
 import uuid
+import time
 import asyncio
 from typing import Dict, List, Optional, Tuple
-from datetime import datetime
 
 from ..models.cards import Deck, Card
 from ..models.player import Player, PlayerStatus
 from ..models.game import (
     GameState, GamePhase, BettingRound, ActionType,
-    PlayerAction, ValidatedAction, PotInfo
+    PlayerAction, ValidatedAction
 )
-from .rules import RulesEngine
+from . import rules
 from .hand_evaluator import HandEvaluator
 
 class PokerGameEngine:
@@ -19,8 +19,10 @@ class PokerGameEngine:
     """
 
     def __init__(self, table_id: str, small_blind: int = 10, big_blind: int = 20):
+        # Hand ids are this table's random base mixed with the hand number
+        self._table_base = uuid.uuid4().int
         self.game_state = GameState(
-            game_id=str(uuid.uuid4()),
+            game_id=self._table_base,
             table_id=table_id,
             small_blind=small_blind,
             big_blind=big_blind,
@@ -28,6 +30,12 @@ class PokerGameEngine:
         )
         self.deck = Deck()
         self._action_callbacks: List[callable] = []
+        self._round_value = self.game_state.betting_round.value  # Cached for action history
+        self._seats: List[Optional[str]] = []  # Seat position -> player_id
+        self._board: List[Card] = []  # All 5 community cards, revealed by street
+        # get_valid_actions results for the state version in _valid_actions_version
+        self._valid_actions_cache: Dict[str, List[dict]] = {}
+        self._valid_actions_version = -1
 
     def add_player(self, player_id: str, username: str, chips: int, seat: int = -1) -> bool:
         """Add a player to the table"""
@@ -35,7 +43,9 @@ class PokerGameEngine:
             return False
 
         if seat == -1:
-            seat = len(self.game_state.players)
+            seat = self._seats.index(None) if None in self._seats else len(self._seats)
+        elif seat < len(self._seats) and self._seats[seat] is not None:
+            return False  # Seat taken
 
         player = Player(
             player_id=player_id,
@@ -46,10 +56,11 @@ class PokerGameEngine:
         )
         
         self.game_state.players[player_id] = player
-        self.game_state.player_order.append(player_id)
-        self.game_state.player_order.sort(
-            key=lambda pid: self.game_state.players[pid].seat_position
-        )
+        self.game_state.mark_changed()
+        if seat >= len(self._seats):
+            self._seats.extend([None] * (seat + 1 - len(self._seats)))
+        self._seats[seat] = player_id
+        self._update_player_order()
         
         return True
 
@@ -58,10 +69,21 @@ class PokerGameEngine:
         if player_id not in self.game_state.players:
             return False
         
+        self._seats[self.game_state.players[player_id].seat_position] = None
         del self.game_state.players[player_id]
-        self.game_state.player_order.remove(player_id)
+        self._update_player_order()
+        self.refresh_round_counters()
         return True
 
+    def _update_player_order(self):
+        """Rebuild seat order from the seat array, skipping eliminated players"""
+        players = self.game_state.players
+        eliminated = PlayerStatus.ELIMINATED
+        self.game_state.player_order = [
+            pid for pid in self._seats
+            if pid is not None and players[pid].status is not eliminated
+        ]
+
     def start_hand(self) -> bool:
         """Start a new hand"""
         # Need at least 2 players with chips
@@ -74,16 +96,18 @@ class PokerGameEngine:
             return False
 
         # Reset game state for new hand
+        self.game_state.mark_changed()
         self.game_state.hand_number += 1
-        self.game_state.game_id = str(uuid.uuid4())
+        self.game_state.game_id = self._table_base ^ self.game_state.hand_number
         self.game_state.phase = GamePhase.DEALING
         self.game_state.betting_round = BettingRound.PREFLOP
+        self._round_value = BettingRound.PREFLOP.value
         self.game_state.community_cards = []
-        self.game_state.pots = [PotInfo(amount=0, eligible_players=[])]
+        self.game_state.reset_pots()
         self.game_state.current_bet = 0
         self.game_state.min_raise = self.game_state.big_blind
         self.game_state.last_raiser_id = None
-        self.game_state.action_history = []
+        self.game_state.clear_action_history()
         self.game_state.hand_winners = []
 
         # Reset players
@@ -91,10 +115,7 @@ class PokerGameEngine:
             player.reset_for_hand()
 
         # Update player order (remove eliminated players)
-        self.game_state.player_order = [
-            pid for pid in self.game_state.player_order
-            if self.game_state.players[pid].status != PlayerStatus.ELIMINATED
-        ]
+        self._update_player_order()
 
         # Rotate dealer
         self._rotate_dealer()
@@ -102,7 +123,9 @@ class PokerGameEngine:
         # Reset and deal
         self.deck.reset()
         self._deal_hole_cards()
+        self._board = self.deck.deal(5)
         self._post_blinds()
+        self.refresh_round_counters()
 
         # Set phase to betting
         self.game_state.phase = GamePhase.BETTING
@@ -114,9 +137,14 @@ class PokerGameEngine:
 
     def _rotate_dealer(self):
         """Move dealer button to next player"""
+        self.game_state.small_blind_id = None
+        self.game_state.big_blind_id = None
+
+        players = self.game_state.players
+        active = PlayerStatus.ACTIVE
         active_players = [
             pid for pid in self.game_state.player_order
-            if self.game_state.players[pid].status == PlayerStatus.ACTIVE
+            if players[pid].status is active
         ]
         
         if not active_players:
@@ -137,14 +165,18 @@ class PokerGameEngine:
             sb_idx = (self.game_state.dealer_position + 1) % num_players
             bb_idx = (self.game_state.dealer_position + 2) % num_players
 
-        self.game_state.players[active_players[sb_idx]].is_small_blind = True
-        self.game_state.players[active_players[bb_idx]].is_big_blind = True
+        self.game_state.small_blind_id = active_players[sb_idx]
+        self.game_state.big_blind_id = active_players[bb_idx]
+        self.game_state.players[self.game_state.small_blind_id].is_small_blind = True
+        self.game_state.players[self.game_state.big_blind_id].is_big_blind = True
 
     def _deal_hole_cards(self):
         """Deal 2 hole cards to each active player"""
+        players = self.game_state.players
+        active = PlayerStatus.ACTIVE
         active_pids = [
             pid for pid in self.game_state.player_order
-            if self.game_state.players[pid].status == PlayerStatus.ACTIVE
+            if players[pid].status is active
         ]
         
         # Deal one card at a time, twice around
@@ -155,27 +187,27 @@ class PokerGameEngine:
 
     def _post_blinds(self):
         """Post small and big blinds"""
-        for player in self.game_state.players.values():
-            if player.is_small_blind:
-                blind_amount = min(self.game_state.small_blind, player.chips)
-                player.chips -= blind_amount
-                player.current_bet = blind_amount
-                player.total_bet = blind_amount
-                self.game_state.pots[0].amount += blind_amount
-                self._add_action_history(player.player_id, "small_blind", blind_amount)
-                
-            elif player.is_big_blind:
-                blind_amount = min(self.game_state.big_blind, player.chips)
-                player.chips -= blind_amount
-                player.current_bet = blind_amount
-                player.total_bet = blind_amount
-                self.game_state.pots[0].amount += blind_amount
-                self.game_state.current_bet = blind_amount
-                self._add_action_history(player.player_id, "big_blind", blind_amount)
-
-    def _set_next_player(self):
+        sb_player = self.game_state.players[self.game_state.small_blind_id]
+        blind_amount = min(self.game_state.small_blind, sb_player.chips)
+        sb_player.chips -= blind_amount
+        sb_player.current_bet = blind_amount
+        sb_player.total_bet = blind_amount
+        self.game_state.add_to_pot(blind_amount)
+        self._add_action_history(sb_player.player_id, "small_blind", blind_amount)
+
+        bb_player = self.game_state.players[self.game_state.big_blind_id]
+        blind_amount = min(self.game_state.big_blind, bb_player.chips)
+        bb_player.chips -= blind_amount
+        bb_player.current_bet = blind_amount
+        bb_player.total_bet = blind_amount
+        self.game_state.add_to_pot(blind_amount)
+        self.game_state.current_bet = blind_amount
+        self._add_action_history(bb_player.player_id, "big_blind", blind_amount)
+
+    def _set_next_player(self, players_to_act: Optional[List[Player]] = None):
         """Set the next player to act"""
-        players_to_act = self.game_state.get_players_to_act()
+        if players_to_act is None:
+            players_to_act = self.game_state.get_players_to_act()
         
         if not players_to_act:
             self.game_state.current_player_id = None
@@ -187,13 +219,12 @@ class PokerGameEngine:
         if self.game_state.current_player_id in current_order:
             current_idx = current_order.index(self.game_state.current_player_id)
             next_idx = (current_idx + 1) % len(current_order)
-        else:
+        elif self.game_state.big_blind_id in current_order:
             # Start from after the big blind position
+            bb_idx = current_order.index(self.game_state.big_blind_id)
+            next_idx = (bb_idx + 1) % len(current_order)
+        else:
             next_idx = 0
-            for i, pid in enumerate(current_order):
-                if self.game_state.players[pid].is_big_blind:
-                    next_idx = (i + 1) % len(current_order)
-                    break
 
         self.game_state.current_player_id = current_order[next_idx]
 
@@ -202,9 +233,12 @@ class PokerGameEngine:
         Process a player's action with full validation.
         Returns the validated action result.
         """
+        game_state = self.game_state
+        player = game_state.players.get(player_id)
+
         # Validate the action
-        is_valid, error_msg, actual_amount = RulesEngine.validate_action(
-            self.game_state, player_id, action
+        is_valid, error_msg, actual_amount = rules.validate_action(
+            game_state, player_id, action, player
         )
 
         if not is_valid:
@@ -217,11 +251,19 @@ class PokerGameEngine:
             )
 
         # Apply the action
-        player = self.game_state.players[player_id]
+        game_state.mark_changed()
         action_type = action.action_type
+        reopened = False
+
+        # Take the (active) actor out of the round counters, re-added below
+        game_state.active_count -= 1
+        if not player.has_acted:
+            game_state.unacted_count -= 1
+        if player.current_bet < game_state.current_bet:
+            game_state.below_bet_count -= 1
 
         if action_type == ActionType.FOLD:
-            player.status = PlayerStatus.FOLDED
+            game_state.set_status(player, PlayerStatus.FOLDED)
             player.last_action = "fold"
 
         elif action_type == ActionType.CHECK:
@@ -231,30 +273,27 @@ class PokerGameEngine:
             player.chips -= actual_amount
             player.current_bet += actual_amount
             player.total_bet += actual_amount
-            self.game_state.pots[0].amount += actual_amount
+            self.game_state.add_to_pot(actual_amount)
             player.last_action = f"call {actual_amount}"
             
             # Check if player is now all-in
             if player.chips == 0:
-                player.status = PlayerStatus.ALL_IN
+                game_state.set_status(player, PlayerStatus.ALL_IN)
 
         elif action_type == ActionType.BET:
             player.chips -= actual_amount
             player.current_bet = actual_amount
             player.total_bet += actual_amount
-            self.game_state.pots[0].amount += actual_amount
+            self.game_state.add_to_pot(actual_amount)
             self.game_state.current_bet = actual_amount
             self.game_state.min_raise = actual_amount
             self.game_state.last_raiser_id = player_id
             player.last_action = f"bet {actual_amount}"
             
-            # Reset has_acted for other players
-            for p in self.game_state.get_players_to_act():
-                if p.player_id != player_id:
-                    p.has_acted = False
+            reopened = True
 
             if player.chips == 0:
-                player.status = PlayerStatus.ALL_IN
+                game_state.set_status(player, PlayerStatus.ALL_IN)
 
         elif action_type == ActionType.RAISE:
             # actual_amount is the amount to add (already validated)
@@ -264,19 +303,16 @@ class PokerGameEngine:
             player.chips -= actual_amount
             player.current_bet = new_total_bet
             player.total_bet += actual_amount
-            self.game_state.pots[0].amount += actual_amount
+            self.game_state.add_to_pot(actual_amount)
             self.game_state.min_raise = max(self.game_state.min_raise, raise_increment)
             self.game_state.current_bet = new_total_bet
             self.game_state.last_raiser_id = player_id
             player.last_action = f"raise to {new_total_bet}"
 
-            # Reset has_acted for other players
-            for p in self.game_state.get_players_to_act():
-                if p.player_id != player_id:
-                    p.has_acted = False
+            reopened = True
 
             if player.chips == 0:
-                player.status = PlayerStatus.ALL_IN
+                game_state.set_status(player, PlayerStatus.ALL_IN)
 
         elif action_type == ActionType.ALL_IN:
             all_in_amount = player.chips
@@ -285,8 +321,8 @@ class PokerGameEngine:
             player.chips = 0
             player.current_bet = new_total_bet
             player.total_bet += all_in_amount
-            self.game_state.pots[0].amount += all_in_amount
-            player.status = PlayerStatus.ALL_IN
+            self.game_state.add_to_pot(all_in_amount)
+            game_state.set_status(player, PlayerStatus.ALL_IN)
             player.last_action = f"all-in {all_in_amount}"
 
             # If this is a raise, update current bet and reset has_acted
@@ -295,21 +331,35 @@ class PokerGameEngine:
                 self.game_state.min_raise = max(self.game_state.min_raise, raise_increment)
                 self.game_state.current_bet = new_total_bet
                 self.game_state.last_raiser_id = player_id
-                
-                for p in self.game_state.get_players_to_act():
-                    if p.player_id != player_id:
-                        p.has_acted = False
+                reopened = True
 
             actual_amount = all_in_amount
 
+        # A bet or raise reopens the action for everyone else, all of whom
+        # are now behind the new bet
+        players_to_act = None
+        if reopened:
+            players_to_act = game_state.get_players_to_act()
+            others = 0
+            for p in players_to_act:
+                if p.player_id != player_id:
+                    p.has_acted = False
+                    others += 1
+            game_state.unacted_count = others
+            game_state.below_bet_count = others
+
         # Mark player as having acted
         player.has_acted = True
+        if player.status == PlayerStatus.ACTIVE:
+            game_state.active_count += 1
+            if player.current_bet < game_state.current_bet:
+                game_state.below_bet_count += 1
         
         # Add to action history
         self._add_action_history(player_id, action_type.value, actual_amount)
 
         # Check if betting round is complete
-        self._check_betting_round_complete()
+        self._check_betting_round_complete(players_to_act)
 
         return ValidatedAction(
             player_id=player_id,
@@ -321,19 +371,48 @@ class PokerGameEngine:
 
     def _add_action_history(self, player_id: str, action: str, amount: int):
         """Add action to history"""
-        self.game_state.action_history.append({
-            "player_id": player_id,
-            "username": self.game_state.players[player_id].username,
-            "action": action,
-            "amount": amount,
-            "round": self.game_state.betting_round.value,
-            "timestamp": datetime.now().isoformat()
-        })
-
-    def _check_betting_round_complete(self):
+        self.game_state.record_action((
+            player_id,
+            self.game_state.players[player_id].username,
+            action,
+            amount,
+            self._round_value,
+            time.time_ns()
+        ))
+
+    def refresh_round_counters(self):
+        """
+        Recount the betting-round counters and status indexes on GameState from
+        the players. process_action keeps them up to date itself; call this
+        after changing player status, bets or has_acted anywhere else.
+        """
+        game_state = self.game_state
+        game_state.mark_changed()
+        game_state.reindex_players()
+        current_bet = game_state.current_bet
+        active_status = PlayerStatus.ACTIVE
+        active = unacted = below = 0
+        for player in game_state.players.values():
+            if player.status is not active_status:
+                continue
+            active += 1
+            if not player.has_acted:
+                unacted += 1
+            if player.current_bet < current_bet:
+                below += 1
+        game_state.active_count = active
+        game_state.unacted_count = unacted
+        game_state.below_bet_count = below
+
+    def _check_betting_round_complete(self, players_to_act: Optional[List[Player]] = None):
         """Check if betting round is complete and advance if so"""
-        if not RulesEngine.is_betting_round_complete(self.game_state):
-            self._set_next_player()
+        round_complete = rules.is_betting_round_complete_fast(self.game_state)
+        # The counters are kept by hand; check them against the full scan
+        # (stripped under python -O)
+        assert round_complete == rules.is_betting_round_complete(self.game_state), \
+            "betting-round counters out of step with player statuses"
+        if not round_complete:
+            self._set_next_player(players_to_act)
             return
 
         # Check if hand should end early (everyone folded except one)
@@ -346,44 +425,50 @@ class PokerGameEngine:
         self._advance_betting_round()
 
     def _advance_betting_round(self):
-        """Advance to the next betting round"""
-        # Reset for new betting round
-        for player in self.game_state.players.values():
-            player.reset_for_betting_round()
-        
-        self.game_state.current_bet = 0
-        self.game_state.min_raise = self.game_state.big_blind
-        self.game_state.last_raiser_id = None
+        """
+        Advance to the next betting round. Keeps dealing through the
+        remaining rounds while fewer than two players can act (others all-in).
+        """
+        while True:
+            # Reset for new betting round
+            for player in self.game_state.players.values():
+                player.reset_for_betting_round()
+            
+            self.game_state.current_bet = 0
+            self.game_state.min_raise = self.game_state.big_blind
+            self.game_state.last_raiser_id = None
 
-        current_round = self.game_state.betting_round
+            current_round = self.game_state.betting_round
 
-        if current_round == BettingRound.PREFLOP:
-            self.game_state.betting_round = BettingRound.FLOP
-            # Deal 3 community cards
-            self.game_state.community_cards.extend(self.deck.deal(3))
-            
-        elif current_round == BettingRound.FLOP:
-            self.game_state.betting_round = BettingRound.TURN
-            # Deal 1 community card
-            self.game_state.community_cards.extend(self.deck.deal(1))
-            
-        elif current_round == BettingRound.TURN:
-            self.game_state.betting_round = BettingRound.RIVER
-            # Deal 1 community card
-            self.game_state.community_cards.extend(self.deck.deal(1))
-            
-        elif current_round == BettingRound.RIVER:
-            # Go to showdown
-            self._end_hand()
-            return
+            if current_round == BettingRound.PREFLOP:
+                self.game_state.betting_round = BettingRound.FLOP
+                # Reveal 3 community cards
+                self.game_state.community_cards = self._board[:3]
+                
+            elif current_round == BettingRound.FLOP:
+                self.game_state.betting_round = BettingRound.TURN
+                # Reveal 1 community card
+                self.game_state.community_cards = self._board[:4]
+                
+            elif current_round == BettingRound.TURN:
+                self.game_state.betting_round = BettingRound.RIVER
+                # Reveal 1 community card
+                self.game_state.community_cards = self._board[:5]
+                
+            elif current_round == BettingRound.RIVER:
+                # Go to showdown
+                self._end_hand()
+                return
+
+            self._round_value = self.game_state.betting_round.value
+            self.refresh_round_counters()
 
-        # Set first player to act (after dealer)
-        self._set_first_to_act()
+            # Set first player to act (after dealer)
+            self._set_first_to_act()
 
-        # If only one player can act (others all-in), continue to next round
-        players_to_act = self.game_state.get_players_to_act()
-        if len(players_to_act) <= 1:
-            self._advance_betting_round()
+            # If only one player can act (others all-in), continue to next round
+            if len(self.game_state.get_players_to_act()) > 1:
+                return
 
     def _set_first_to_act(self):
         """Set the first player to act after flop (left of dealer)"""
@@ -422,8 +507,7 @@ class PokerGameEngine:
             self._evaluate_showdown(active_players)
 
         # Mark pots as empty
-        for pot in self.game_state.pots:
-            pot.amount = 0
+        self.game_state.empty_pots()
 
         self.game_state.phase = GamePhase.HAND_COMPLETE
 
@@ -459,9 +543,21 @@ class PokerGameEngine:
                 "cards": [str(c) for c in best_cards]
             })
 
-    def get_valid_actions(self, player_id: str) -> List[dict]:
-        """Get valid actions for a player"""
-        return RulesEngine.get_valid_actions(self.game_state, player_id)
+    def get_valid_actions(self, player_id: str, player: Optional[Player] = None) -> List[dict]:
+        """
+        Get valid actions for a player.
+        Cached until the state changes, so the list must be treated as read-only.
+        """
+        game_state = self.game_state
+        if self._valid_actions_version != game_state.state_version:
+            self._valid_actions_cache.clear()
+            self._valid_actions_version = game_state.state_version
+        actions = self._valid_actions_cache.get(player_id)
+        if actions is None:
+            actions = self._valid_actions_cache[player_id] = [
+                a._asdict() for a in rules.get_valid_actions(game_state, player_id, player)
+            ]
+        return actions
 
     def get_state_for_player(self, player_id: str) -> dict:
         """Get game state with private info for specific player"""
@@ -471,4 +567,22 @@ class PokerGameEngine:
 
     def get_public_state(self) -> dict:
         """Get public game state (for viewers)"""
-        return self.game_state.to_public_dict()
\ No newline at end of file
+        return self.game_state.to_public_dict()
+
+    def get_broadcast_payloads(self, player_ids: List[str]) -> Tuple[dict, Dict[str, dict]]:
+        """
+        Get the public state plus, for each player, only the fields that differ
+        from it. {**public_state, **overlays[pid]} equals get_state_for_player(pid).
+        """
+        public_state = self.get_public_state()
+        players = self.game_state.players
+        overlays = {}
+        for pid in player_ids:
+            overlay = {}
+            player = players.get(pid)
+            if player is not None:
+                overlay["players"] = {**public_state["players"], pid: player.to_private_dict()}
+                overlay["your_hole_cards"] = player.hole_cards_json()
+            overlay["valid_actions"] = self.get_valid_actions(pid, player)
+            overlays[pid] = overlay
+        return public_state, overlays
\ No newline at end of file
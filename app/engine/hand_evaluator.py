@@ -1,6 +1,7 @@
-from typing import List, Tuple, Optional
-from collections import Counter
-from itertools import combinations
+from typing import Dict, List, Tuple, Optional
+from collections import OrderedDict
+from itertools import combinations_with_replacement
+from operator import itemgetter
 from ..models.cards import Card, Rank, Suit
 
 class HandRank:
@@ -35,6 +36,10 @@ class HandEvaluator:
     Returns a tuple of (hand_rank, tiebreaker_values, hand_name)
     """
 
+    # Best-hand results, board card mask -> hole card mask -> result,
+    # with boards kept in least-recently-used order
+    _board_cache: "OrderedDict[int, Dict[int, Tuple[int, List[int], List[Card], int]]]" = OrderedDict()
+
     @staticmethod
     def evaluate_hand(cards: List[Card]) -> Tuple[int, List[int], str]:
         """
@@ -44,69 +49,76 @@ class HandEvaluator:
         if len(cards) != 5:
             raise ValueError("Hand must contain exactly 5 cards")
 
-        ranks = sorted([c.rank.value for c in cards], reverse=True)
-        suits = [c.suit for c in cards]
-        rank_counts = Counter(ranks)
-        
-        is_flush = len(set(suits)) == 1
-        is_straight, straight_high = HandEvaluator._check_straight(ranks)
+        c1, c2, c3, c4, c5 = encode_cards(cards)
+        q = (c1 | c2 | c3 | c4 | c5) >> 16
 
-        # Check for each hand type from highest to lowest
-        if is_straight and is_flush:
-            if straight_high == 14:  # Ace high straight flush
-                return (HandRank.ROYAL_FLUSH, [14], HandRank.NAMES[HandRank.ROYAL_FLUSH])
-            return (HandRank.STRAIGHT_FLUSH, [straight_high], HandRank.NAMES[HandRank.STRAIGHT_FLUSH])
+        if c1 & c2 & c3 & c4 & c5 & 0xF000:
+            value = FLUSH_LUT[q]
+        else:
+            value = UNIQUE5_LUT.get(q)
+            if value is None:
+                value = UNSUITED_LUT[(c1 & 0xFF) * (c2 & 0xFF) * (c3 & 0xFF) * (c4 & 0xFF) * (c5 & 0xFF)]
 
-        if 4 in rank_counts.values():
-            quad_rank = [r for r, c in rank_counts.items() if c == 4][0]
-            kicker = [r for r, c in rank_counts.items() if c == 1][0]
-            return (HandRank.FOUR_OF_A_KIND, [quad_rank, kicker], HandRank.NAMES[HandRank.FOUR_OF_A_KIND])
+        rank, tiebreakers = HAND_CLASSES[value]
+        return rank, list(tiebreakers), HandRank.NAMES[rank]
 
-        if 3 in rank_counts.values() and 2 in rank_counts.values():
-            trips_rank = [r for r, c in rank_counts.items() if c == 3][0]
-            pair_rank = [r for r, c in rank_counts.items() if c == 2][0]
-            return (HandRank.FULL_HOUSE, [trips_rank, pair_rank], HandRank.NAMES[HandRank.FULL_HOUSE])
+    @staticmethod
+    def _classify(ranks: List[int], is_flush: bool) -> Tuple[int, List[int]]:
+        """
+        Classify five ranks (sorted high to low) into (rank, tiebreakers).
+        Only used to build the lookup tables at import time.
+        """
+        counts = [0] * 15
+        for r in ranks:
+            counts[r] += 1
 
-        if is_flush:
-            return (HandRank.FLUSH, ranks, HandRank.NAMES[HandRank.FLUSH])
+        # Single pass over the histogram, highest rank first
+        quad_rank = trips_rank = 0
+        pairs, singles = [], []
+        for r in range(14, 1, -1):
+            count = counts[r]
+            if count == 1:
+                singles.append(r)
+            elif count == 2:
+                pairs.append(r)
+            elif count == 3:
+                trips_rank = r
+            elif count == 4:
+                quad_rank = r
 
-        if is_straight:
-            return (HandRank.STRAIGHT, [straight_high], HandRank.NAMES[HandRank.STRAIGHT])
+        # Most common hand types first; the count patterns are mutually exclusive
+        if len(singles) == 5:
+            rank_mask = 0
+            for r in ranks:
+                rank_mask |= 1 << r
+            straight_high = HandEvaluator._check_straight(rank_mask)
+            if straight_high and is_flush:
+                if straight_high == 14:  # Ace high straight flush
+                    return HandRank.ROYAL_FLUSH, [14]
+                return HandRank.STRAIGHT_FLUSH, [straight_high]
+            if is_flush:
+                return HandRank.FLUSH, ranks
+            if straight_high:
+                return HandRank.STRAIGHT, [straight_high]
+            return HandRank.HIGH_CARD, ranks
 
-        if 3 in rank_counts.values():
-            trips_rank = [r for r, c in rank_counts.items() if c == 3][0]
-            kickers = sorted([r for r, c in rank_counts.items() if c == 1], reverse=True)
-            return (HandRank.THREE_OF_A_KIND, [trips_rank] + kickers, HandRank.NAMES[HandRank.THREE_OF_A_KIND])
+        if len(pairs) == 1 and not trips_rank:
+            return HandRank.PAIR, pairs + singles
 
-        if list(rank_counts.values()).count(2) == 2:
-            pairs = sorted([r for r, c in rank_counts.items() if c == 2], reverse=True)
-            kicker = [r for r, c in rank_counts.items() if c == 1][0]
-            return (HandRank.TWO_PAIR, pairs + [kicker], HandRank.NAMES[HandRank.TWO_PAIR])
+        if len(pairs) == 2:
+            return HandRank.TWO_PAIR, pairs + singles
 
-        if 2 in rank_counts.values():
-            pair_rank = [r for r, c in rank_counts.items() if c == 2][0]
-            kickers = sorted([r for r, c in rank_counts.items() if c == 1], reverse=True)
-            return (HandRank.PAIR, [pair_rank] + kickers, HandRank.NAMES[HandRank.PAIR])
+        if trips_rank:
+            if pairs:
+                return HandRank.FULL_HOUSE, [trips_rank, pairs[0]]
+            return HandRank.THREE_OF_A_KIND, [trips_rank] + singles
 
-        return (HandRank.HIGH_CARD, ranks, HandRank.NAMES[HandRank.HIGH_CARD])
+        return HandRank.FOUR_OF_A_KIND, [quad_rank] + singles
 
     @staticmethod
-    def _check_straight(ranks: List[int]) -> Tuple[bool, int]:
-        """Check if ranks form a straight, return (is_straight, high_card)"""
-        unique_ranks = sorted(set(ranks), reverse=True)
-        
-        if len(unique_ranks) != 5:
-            return False, 0
-
-        # Check for regular straight
-        if unique_ranks[0] - unique_ranks[4] == 4:
-            return True, unique_ranks[0]
-
-        # Check for wheel (A-2-3-4-5)
-        if unique_ranks == [14, 5, 4, 3, 2]:
-            return True, 5  # 5-high straight
-
-        return False, 0
+    def _check_straight(rank_mask: int) -> int:
+        """High card of the straight formed by exactly these five ranks, 0 if none"""
+        return HandEvaluator._straight_high(rank_mask)
 
     @staticmethod
     def get_best_hand(hole_cards: List[Card], community_cards: List[Card]) -> Tuple[List[Card], int, List[int], str]:
@@ -114,38 +126,166 @@ class HandEvaluator:
         Find the best 5-card hand from 7 cards.
         Returns (best_5_cards, rank, tiebreakers, hand_name)
         """
+        rank, tiebreakers, best_hand, _ = HandEvaluator._lookup_best_hand(
+            hole_cards, community_cards, card_mask(community_cards), encode_cards(community_cards)
+        )
+        return list(best_hand), rank, list(tiebreakers), HandRank.NAMES[rank]
+
+    @staticmethod
+    def _lookup_best_hand(
+        hole_cards: List[Card], community_cards: List[Card], board_mask: int, board_codes: List[int]
+    ) -> Tuple[int, List[int], List[Card], int]:
+        """
+        Cached best-hand evaluation, with the community cards' mask and
+        encoding already computed so they can be shared between players.
+        Returns (rank, tiebreakers, best_5_cards, score); the lists are shared, do not mutate
+        """
         all_cards = hole_cards + community_cards
         if len(all_cards) < 5:
             raise ValueError("Need at least 5 cards to evaluate")
 
-        best_hand = None
-        best_rank = (0, [], "")
+        boards = HandEvaluator._board_cache
+        hands = boards.get(board_mask)
+        if hands is None:
+            if len(boards) >= EVAL_CACHE_BOARDS:
+                boards.popitem(last=False)  # Evict the least recently used board
+            hands = boards[board_mask] = {}
+        else:
+            boards.move_to_end(board_mask)
+
+        hole_mask = card_mask(hole_cards)
+        result = hands.get(hole_mask)
+        if result is None:
+            rank, tiebreakers, best = HandEvaluator._evaluate_codes(encode_cards(hole_cards) + board_codes)
+            best_hand = [all_cards[i] for i in best]
+            result = hands[hole_mask] = (rank, tiebreakers, best_hand, hand_score(rank, tiebreakers))
+        return result
+
+    @staticmethod
+    def _straight_high(rank_mask: int) -> int:
+        """High card of the best straight in a rank bitmask (bit r = rank r), 0 if none"""
+        run = rank_mask & (rank_mask >> 1) & (rank_mask >> 2) & (rank_mask >> 3) & (rank_mask >> 4)
+        if run:
+            return run.bit_length() + 3
+        if rank_mask & WHEEL_MASK == WHEEL_MASK:
+            return 5
+        return 0
+
+    @staticmethod
+    def _evaluate_codes(codes: List[int]) -> Tuple[int, List[int], List[int]]:
+        """
+        Evaluate the best 5-card hand out of 5 to 7 Cactus-Kev encoded
+        cards in a single pass, without enumerating combinations.
+        Works on plain ints only; returns (rank, tiebreakers, best_5_indices)
+        """
+        by_rank: List[List[int]] = [[] for _ in range(15)]
+        suits = [0] * len(codes)
+        suit_masks = [0] * 9  # Indexed by suit bit
+        rank_mask = 0
+        for i, code in enumerate(codes):
+            r = ((code >> 8) & 0xF) + 2
+            suit = (code >> 12) & 0xF
+            by_rank[r].append(i)
+            suits[i] = suit
+            suit_masks[suit] |= 1 << r
+            rank_mask |= 1 << r
+
+        flush_suit = 0
+        for suit in (1, 2, 4, 8):
+            if suit_masks[suit].bit_count() >= 5:
+                flush_suit = suit
+                break
+
+        # Group ranks by multiplicity, highest rank first
+        quads, trips, pairs, singles = [], [], [], []
+        groups = (None, singles, pairs, trips, quads)
+        for r in range(14, 1, -1):
+            if by_rank[r]:
+                groups[len(by_rank[r])].append(r)
+
+        # Common case first: no flush and fewer than 5 distinct ranks rules
+        # out everything but high card, pair and two pair (and trips below)
+        if not flush_suit and not trips and not quads:
+            high = HandEvaluator._straight_high(rank_mask) if len(singles) + len(pairs) >= 5 else 0
+            if not high:
+                if not pairs:
+                    ranks = singles[:5]
+                    return HandRank.HIGH_CARD, ranks, [by_rank[r][0] for r in ranks]
+
+                if len(pairs) == 1:
+                    pair_rank = pairs[0]
+                    kickers = singles[:3]
+                    return HandRank.PAIR, [pair_rank] + kickers, by_rank[pair_rank] + [by_rank[r][0] for r in kickers]
+
+                high_pair, low_pair = pairs[0], pairs[1]
+                kicker = max(pairs[2:3] + singles[:1])
+                best = by_rank[high_pair] + by_rank[low_pair] + by_rank[kicker][:1]
+                return HandRank.TWO_PAIR, [high_pair, low_pair, kicker], best
 
-        for combo in combinations(all_cards, 5):
-            hand_cards = list(combo)
-            rank, tiebreakers, name = HandEvaluator.evaluate_hand(hand_cards)
-            
-            if (rank, tiebreakers) > (best_rank[0], best_rank[1]):
-                best_rank = (rank, tiebreakers, name)
-                best_hand = hand_cards
+        if quads:
+            quad_rank = quads[0]
+            kicker = max(r for r in range(2, 15) if by_rank[r] and r != quad_rank)
+            return HandRank.FOUR_OF_A_KIND, [quad_rank, kicker], by_rank[quad_rank] + by_rank[kicker][:1]
 
-        return best_hand, best_rank[0], best_rank[1], best_rank[2]
+        if trips and (len(trips) > 1 or pairs):
+            trips_rank = trips[0]
+            pair_rank = max(trips[1:] + pairs[:1])
+            return HandRank.FULL_HOUSE, [trips_rank, pair_rank], by_rank[trips_rank] + by_rank[pair_rank][:2]
+
+        # With at most 7 cards a straight flush cannot share the hand with
+        # quads or a full house, so it is safe to test it after them
+        if flush_suit:
+            flush_mask = suit_masks[flush_suit]
+            high = HandEvaluator._straight_high(flush_mask)
+            if high:
+                ranks = [high, high - 1, high - 2, high - 3, high - 4 if high > 5 else 14]
+                best = [i for r in ranks for i in by_rank[r] if suits[i] == flush_suit]
+                if high == 14:
+                    return HandRank.ROYAL_FLUSH, [14], best
+                return HandRank.STRAIGHT_FLUSH, [high], best
+
+            ranks = [r for r in range(14, 1, -1) if flush_mask >> r & 1][:5]
+            best = [i for r in ranks for i in by_rank[r] if suits[i] == flush_suit]
+            return HandRank.FLUSH, ranks, best
+
+        high = HandEvaluator._straight_high(rank_mask)
+        if high:
+            ranks = [high, high - 1, high - 2, high - 3, high - 4 if high > 5 else 14]
+            return HandRank.STRAIGHT, [high], [by_rank[r][0] for r in ranks]
+
+        trips_rank = trips[0]
+        kickers = singles[:2]
+        return HandRank.THREE_OF_A_KIND, [trips_rank] + kickers, by_rank[trips_rank] + [by_rank[r][0] for r in kickers]
 
     @staticmethod
     def compare_hands(
         hands: List[Tuple[str, List[Card], List[Card]]]  # [(player_id, hole_cards, community_cards), ...]
-    ) -> List[Tuple[str, int, List[int], str, List[Card]]]:
+    ) -> List[Tuple[str, int, List[int], str, List[Card], int]]:
         """
         Compare multiple hands and return sorted results (best first).
-        Returns [(player_id, rank, tiebreakers, hand_name, best_cards), ...]
+        Returns [(player_id, rank, tiebreakers, hand_name, best_cards, score), ...]
         """
+        results = HandEvaluator._score_hands(hands)
+
+        # Sort by packed score, which orders by rank then tiebreakers
+        results.sort(key=itemgetter(5), reverse=True)
+        return results
+
+    @staticmethod
+    def _score_hands(
+        hands: List[Tuple[str, List[Card], List[Card]]]
+    ) -> List[Tuple[str, int, List[int], str, List[Card], int]]:
+        """Evaluate each hand in input order, same rows as compare_hands"""
         results = []
+        boards = {}  # Players usually share one board, mask and encode it once
         for player_id, hole_cards, community_cards in hands:
-            best_cards, rank, tiebreakers, name = HandEvaluator.get_best_hand(hole_cards, community_cards)
-            results.append((player_id, rank, tiebreakers, name, best_cards))
-
-        # Sort by rank (desc), then tiebreakers (desc)
-        results.sort(key=lambda x: (x[1], x[2]), reverse=True)
+            board = boards.get(id(community_cards))
+            if board is None:
+                board = boards[id(community_cards)] = (card_mask(community_cards), encode_cards(community_cards))
+            rank, tiebreakers, best_cards, score = HandEvaluator._lookup_best_hand(
+                hole_cards, community_cards, *board
+            )
+            results.append((player_id, rank, list(tiebreakers), HandRank.NAMES[rank], list(best_cards), score))
         return results
 
     @staticmethod
@@ -159,19 +299,101 @@ class HandEvaluator:
         if not hands:
             return []
 
-        sorted_hands = HandEvaluator.compare_hands(hands)
-        
-        if not sorted_hands:
-            return []
-
-        # Find all players tied for best hand
-        best_rank = sorted_hands[0][1]
-        best_tiebreakers = sorted_hands[0][2]
+        # Only the best score matters here, so skip compare_hands' sort
+        results = HandEvaluator._score_hands(hands)
+        best_score = max(map(itemgetter(5), results))
 
+        # Find all players tied for best hand, in input order
         winners = [
             (pid, rank, name, cards)
-            for pid, rank, tiebreakers, name, cards in sorted_hands
-            if rank == best_rank and tiebreakers == best_tiebreakers
+            for pid, rank, tiebreakers, name, cards, score in results
+            if score == best_score
         ]
 
-        return winners
\ No newline at end of file
+        return winners
+
+
+# Cactus-Kev card encoding, one int per card:
+#   xxxbbbbb bbbbbbbb cdhsrrrr xxpppppp
+# b = rank bit, cdhs = suit bit, r = rank index (0-12), p = rank prime
+PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+SUIT_BITS = {Suit.SPADES: 0x1, Suit.HEARTS: 0x2, Suit.DIAMONDS: 0x4, Suit.CLUBS: 0x8}
+
+# Rank and suit parts of the encoding; Rank is an IntEnum so it indexes directly
+RANK_CODES = [0, 0] + [PRIMES[i] | (i << 8) | (1 << (16 + i)) for i in range(13)]
+SUIT_CODES = {suit: bit << 12 for suit, bit in SUIT_BITS.items()}
+
+
+def encode_card(card: Card) -> int:
+    """Encode a card in Cactus-Kev format"""
+    return RANK_CODES[card.rank] | SUIT_CODES[card.suit]
+
+
+def encode_cards(cards: List[Card]) -> List[int]:
+    """Encode a list of cards in Cactus-Kev format"""
+    return [RANK_CODES[c.rank] | SUIT_CODES[c.suit] for c in cards]
+
+
+def card_mask(cards: List[Card]) -> int:
+    """Bitmask with one bit set per card (bit = Card.index), identifying a set of cards"""
+    mask = 0
+    for c in cards:
+        mask |= 1 << c.index
+    return mask
+
+
+def hand_score(rank: int, tiebreakers: List[int]) -> int:
+    """Pack rank and up to five tiebreakers into one int that orders hands"""
+    score = rank
+    for i in range(5):
+        score = (score << 8) | (tiebreakers[i] if i < len(tiebreakers) else 0)
+    return score
+
+
+# Maximum number of boards kept in the best-hand cache (each holds at most
+# one entry per distinct set of hole cards seen on it)
+EVAL_CACHE_BOARDS = 20_000
+
+# A-2-3-4-5 in a rank bitmask where bit r is set for rank r
+WHEEL_MASK = (1 << 14) | (1 << 5) | (1 << 4) | (1 << 3) | (1 << 2)
+
+
+def _build_lookup_tables():
+    """
+    Enumerate the 7462 distinct 5-card hand classes, best first.
+    Flushes and five-distinct-rank hands are keyed by their 13-bit rank
+    mask, everything else by the product of the rank primes.
+    """
+    classes = []  # (rank, tiebreakers, table, key)
+    for combo in combinations_with_replacement(range(14, 1, -1), 5):
+        ranks = list(combo)
+        if ranks[0] == ranks[4]:  # Ranks are non-increasing, so this is five of a kind
+            continue
+
+        if len(set(ranks)) == 5:
+            mask = 0
+            for r in ranks:
+                mask |= 1 << (r - 2)
+            rank, tiebreakers = HandEvaluator._classify(ranks, is_flush=True)
+            classes.append((rank, tiebreakers, "flush", mask))
+            rank, tiebreakers = HandEvaluator._classify(ranks, is_flush=False)
+            classes.append((rank, tiebreakers, "unique5", mask))
+        else:
+            product = 1
+            for r in ranks:
+                product *= PRIMES[r - 2]
+            rank, tiebreakers = HandEvaluator._classify(ranks, is_flush=False)
+            classes.append((rank, tiebreakers, "unsuited", product))
+
+    classes.sort(key=lambda x: (x[0], x[1]), reverse=True)
+
+    tables = {"flush": {}, "unique5": {}, "unsuited": {}}
+    hand_classes = [(0, ())]  # Values are 1-based, 1 = royal flush
+    for rank, tiebreakers, table, key in classes:
+        tables[table][key] = len(hand_classes)
+        hand_classes.append((rank, tuple(tiebreakers)))
+
+    return tables["flush"], tables["unique5"], tables["unsuited"], hand_classes
+
+
+FLUSH_LUT, UNIQUE5_LUT, UNSUITED_LUT, HAND_CLASSES = _build_lookup_tables()
@@ -1,247 +1,284 @@
-from typing import Optional, Tuple, List
-from ..models.game import GameState, ActionType, GamePhase, PlayerAction
-from ..models.player import Player, PlayerStatus
-
-class RulesEngine:
+from functools import lru_cache
+from typing import Optional, Tuple, List, NamedTuple
+from ..models.game import GameState, ActionType, GamePhase, PlayerAction, BettingRound
+from ..models.player import Player, PlayerStatus, IN_HAND_STATUSES
+
+# Action type strings, resolved once at import
+_BET_V = ActionType.BET.value
+_CALL_V = ActionType.CALL.value
+_RAISE_V = ActionType.RAISE.value
+_ALL_IN_V = ActionType.ALL_IN.value
+
+class ValidAction(NamedTuple):
+    """A legal action and its amount range; converted with _asdict() for the API"""
+    action_type: str
+    min_amount: int
+    max_amount: int
+
+# Fixed valid-action entries, shared between calls
+_FOLD_ENTRY = ValidAction(ActionType.FOLD.value, 0, 0)
+_CHECK_ENTRY = ValidAction(ActionType.CHECK.value, 0, 0)
+
+def validate_action(
+    game_state: GameState,
+    player_id: str,
+    action: PlayerAction,
+    player: Optional[Player] = None
+) -> Tuple[bool, str, Optional[int]]:
     """
-    Enforces poker rules and validates player actions.
+    Validate a player's action.
+    Pass player if the caller already looked it up, to skip a second lookup.
+    Returns (is_valid, error_message, actual_amount)
     """
+    # Check if it's this player's turn
+    if game_state.current_player_id != player_id:
+        return False, f"Not your turn. Current player: {game_state.current_player_id}", None
 
-    @staticmethod
-    def validate_action(
-        game_state: GameState,
-        player_id: str,
-        action: PlayerAction
-    ) -> Tuple[bool, str, Optional[int]]:
-        """
-        Validate a player's action.
-        Returns (is_valid, error_message, actual_amount)
-        """
-        # Check if it's this player's turn
-        if game_state.current_player_id != player_id:
-            return False, f"Not your turn. Current player: {game_state.current_player_id}", None
-
-        # Check if game is in betting phase
-        if game_state.phase != GamePhase.BETTING:
-            return False, f"Cannot act during {game_state.phase.value} phase", None
-
-        # Get player
-        player = game_state.players.get(player_id)
-        if not player:
-            return False, "Player not found", None
-
-        # Check player status
-        if player.status not in [PlayerStatus.ACTIVE]:
-            return False, f"Player cannot act with status: {player.status.value}", None
-
-        # Validate specific action
-        action_type = action.action_type
-        amount = action.amount or 0
-
-        if action_type == ActionType.FOLD:
-            return True, "", 0
-
-        elif action_type == ActionType.CHECK:
-            return RulesEngine._validate_check(game_state, player)
-
-        elif action_type == ActionType.CALL:
-            return RulesEngine._validate_call(game_state, player)
-
-        elif action_type == ActionType.BET:
-            return RulesEngine._validate_bet(game_state, player, amount)
+    # Check if game is in betting phase
+    if game_state.phase != GamePhase.BETTING:
+        return False, f"Cannot act during {game_state.phase.value} phase", None
 
-        elif action_type == ActionType.RAISE:
-            return RulesEngine._validate_raise(game_state, player, amount)
+    # Get player
+    if player is None:
+        player = game_state.players.get(player_id)
+    if not player:
+        return False, "Player not found", None
 
-        elif action_type == ActionType.ALL_IN:
-            return True, "", player.chips
+    # Check player status
+    if player.status is not PlayerStatus.ACTIVE:
+        return False, f"Player cannot act with status: {player.status.value}", None
 
+    # Validate specific action
+    action_type = action.action_type
+    validator = _VALIDATORS.get(action_type)
+    if validator is None:
         return False, f"Unknown action type: {action_type}", None
 
-    @staticmethod
-    def _validate_check(game_state: GameState, player: Player) -> Tuple[bool, str, Optional[int]]:
-        """Validate a check action"""
-        # Can only check if no bet to call
-        amount_to_call = game_state.current_bet - player.current_bet
-        if amount_to_call > 0:
-            return False, f"Cannot check. Must call {amount_to_call} or fold", None
-        return True, "", 0
-
-    @staticmethod
-    def _validate_call(game_state: GameState, player: Player) -> Tuple[bool, str, Optional[int]]:
-        """Validate a call action"""
-        amount_to_call = game_state.current_bet - player.current_bet
-        
-        if amount_to_call <= 0:
-            return False, "Nothing to call. Use check instead", None
-        
-        # If player doesn't have enough, they go all-in
-        actual_amount = min(amount_to_call, player.chips)
-        return True, "", actual_amount
-
-    @staticmethod
-    def _validate_bet(game_state: GameState, player: Player, amount: int) -> Tuple[bool, str, Optional[int]]:
-        """Validate a bet action (first bet in a round)"""
-        # Can only bet if no one has bet yet
-        if game_state.current_bet > 0:
-            return False, "Cannot bet when there's an existing bet. Use raise instead", None
-
-        # Minimum bet is the big blind
-        min_bet = game_state.big_blind
-        
-        if amount < min_bet:
-            return False, f"Minimum bet is {min_bet}", None
-
-        if amount > player.chips:
-            return False, f"Cannot bet {amount}. You only have {player.chips} chips", None
+    amount_to_call = game_state.current_bet - player.current_bet
+    return validator(game_state, player, action.amount or 0, amount_to_call)
+
+def _validate_fold(game_state: GameState, player: Player, amount: int,
+                   amount_to_call: int) -> Tuple[bool, str, Optional[int]]:
+    """Validate a fold action (always allowed)"""
+    return True, "", 0
+
+def _validate_check(game_state: GameState, player: Player, amount: int,
+                    amount_to_call: int) -> Tuple[bool, str, Optional[int]]:
+    """Validate a check action"""
+    # Can only check if no bet to call
+    if amount_to_call > 0:
+        return False, f"Cannot check. Must call {amount_to_call} or fold", None
+    return True, "", 0
+
+def _validate_call(game_state: GameState, player: Player, amount: int,
+                   amount_to_call: int) -> Tuple[bool, str, Optional[int]]:
+    """Validate a call action"""
+    if amount_to_call <= 0:
+        return False, "Nothing to call. Use check instead", None
+    
+    # If player doesn't have enough, they go all-in
+    chips = player.chips
+    actual_amount = amount_to_call if amount_to_call < chips else chips
+    return True, "", actual_amount
+
+def _validate_bet(game_state: GameState, player: Player, amount: int,
+                  amount_to_call: int) -> Tuple[bool, str, Optional[int]]:
+    """Validate a bet action (first bet in a round)"""
+    # Can only bet if no one has bet yet
+    if game_state.current_bet > 0:
+        return False, "Cannot bet when there's an existing bet. Use raise instead", None
+
+    # Minimum bet is the big blind
+    min_bet = game_state.big_blind
+    
+    if amount < min_bet:
+        return False, f"Minimum bet is {min_bet}", None
+
+    chips = player.chips
+    if amount > chips:
+        return False, f"Cannot bet {amount}. You only have {chips} chips", None
+
+    return True, "", amount
+
+def _validate_raise(game_state: GameState, player: Player, amount: int,
+                    amount_to_call: int) -> Tuple[bool, str, Optional[int]]:
+    """
+    Validate a raise action.
+    'amount' is the TOTAL bet the player wants to make (not the raise increment)
+    """
+    current_bet = game_state.current_bet
+    if current_bet == 0:
+        return False, "Cannot raise when there's no bet. Use bet instead", None
+
+    chips = player.chips
+    
+    # The raise amount (increment above current bet)
+    raise_increment = amount - current_bet
+    
+    # Minimum raise is the larger of: big blind or the last raise amount
+    min_raise_increment = game_state.min_raise
+    
+    if raise_increment < min_raise_increment:
+        min_total = current_bet + min_raise_increment
+        # Allow all-in for less if player doesn't have enough
+        if amount >= chips:
+            return True, "", chips  # All-in
+        return False, f"Minimum raise to {min_total} (raise by at least {min_raise_increment})", None
+
+    total_needed = amount - player.current_bet  # Amount player needs to add
+    
+    if total_needed > chips:
+        return False, f"Cannot raise to {amount}. You only have {chips} chips", None
+
+    return True, "", total_needed
+
+def _validate_all_in(game_state: GameState, player: Player, amount: int,
+                     amount_to_call: int) -> Tuple[bool, str, Optional[int]]:
+    """Validate an all-in action (always allowed, commits every chip)"""
+    return True, "", player.chips
+
+# Action type -> validator(game_state, player, amount, amount_to_call)
+_VALIDATORS = {
+    ActionType.FOLD: _validate_fold,
+    ActionType.CHECK: _validate_check,
+    ActionType.CALL: _validate_call,
+    ActionType.BET: _validate_bet,
+    ActionType.RAISE: _validate_raise,
+    ActionType.ALL_IN: _validate_all_in,
+}
+
+def get_valid_actions(game_state: GameState, player_id: str,
+                      player: Optional[Player] = None) -> List[ValidAction]:
+    """
+    Get list of valid actions for a player.
+    Pass player if the caller already looked it up, to skip a second lookup.
+    Returns list of ValidAction(action_type, min_amount, max_amount)
+    """
+    # Cheapest check first: only the current player has any actions
+    if game_state.current_player_id != player_id:
+        return []
 
-        return True, "", amount
+    if player is None:
+        player = game_state.players.get(player_id)
+    if not player or player.status != PlayerStatus.ACTIVE:
+        return []
 
-    @staticmethod
-    def _validate_raise(game_state: GameState, player: Player, amount: int) -> Tuple[bool, str, Optional[int]]:
-        """
-        Validate a raise action.
-        'amount' is the TOTAL bet the player wants to make (not the raise increment)
-        """
-        if game_state.current_bet == 0:
-            return False, "Cannot raise when there's no bet. Use bet instead", None
+    return list(_valid_actions_for(
+        game_state.current_bet, player.current_bet, player.chips,
+        game_state.min_raise, game_state.big_blind
+    ))
 
-        amount_to_call = game_state.current_bet - player.current_bet
-        
-        # The raise amount (increment above current bet)
-        raise_increment = amount - game_state.current_bet
-        
-        # Minimum raise is the larger of: big blind or the last raise amount
-        min_raise_increment = game_state.min_raise
-        
-        if raise_increment < min_raise_increment:
-            min_total = game_state.current_bet + min_raise_increment
-            # Allow all-in for less if player doesn't have enough
-            if amount >= player.chips:
-                return True, "", player.chips  # All-in
-            return False, f"Minimum raise to {min_total} (raise by at least {min_raise_increment})", None
-
-        total_needed = amount - player.current_bet  # Amount player needs to add
-        
-        if total_needed > player.chips:
-            return False, f"Cannot raise to {amount}. You only have {player.chips} chips", None
+@lru_cache(maxsize=1024)
+def _valid_actions_for(current_bet: int, player_bet: int, chips: int,
+                       min_raise: int, big_blind: int) -> Tuple[ValidAction, ...]:
+    """
+    Valid actions for an active player on turn, from the only values they depend on.
+    Cached: the player, viewers and admins all ask again until the next action
+    changes one of the arguments.
+    """
+    amount_to_call = current_bet - player_bet
 
-        return True, "", total_needed
+    # Fold is always valid
+    valid_actions = [_FOLD_ENTRY]
 
-    @staticmethod
-    def get_valid_actions(game_state: GameState, player_id: str) -> List[dict]:
-        """
-        Get list of valid actions for a player.
-        Returns list of {action_type, min_amount, max_amount}
-        """
-        player = game_state.players.get(player_id)
-        if not player or player.status != PlayerStatus.ACTIVE:
-            return []
-
-        if game_state.current_player_id != player_id:
-            return []
-
-        valid_actions = []
-        amount_to_call = game_state.current_bet - player.current_bet
-
-        # Fold is always valid
-        valid_actions.append({
-            "action_type": ActionType.FOLD.value,
-            "min_amount": 0,
-            "max_amount": 0
-        })
-
-        if amount_to_call == 0:
-            # Can check
-            valid_actions.append({
-                "action_type": ActionType.CHECK.value,
-                "min_amount": 0,
-                "max_amount": 0
-            })
-            
-            # Can bet (if has chips)
-            if player.chips > 0:
-                min_bet = min(game_state.big_blind, player.chips)
-                valid_actions.append({
-                    "action_type": ActionType.BET.value,
-                    "min_amount": min_bet,
-                    "max_amount": player.chips
-                })
-        else:
-            # Can call
-            call_amount = min(amount_to_call, player.chips)
-            valid_actions.append({
-                "action_type": ActionType.CALL.value,
-                "min_amount": call_amount,
-                "max_amount": call_amount
-            })
-
-            # Can raise (if has chips beyond call amount)
-            if player.chips > amount_to_call:
-                min_raise_to = game_state.current_bet + game_state.min_raise
-                min_raise_amount = min_raise_to - player.current_bet
-                max_raise_amount = player.chips
-                
-                if max_raise_amount >= min_raise_amount:
-                    valid_actions.append({
-                        "action_type": ActionType.RAISE.value,
-                        "min_amount": min(min_raise_to, player.chips + player.current_bet),
-                        "max_amount": player.chips + player.current_bet
-                    })
-
-        # All-in is always valid if player has chips
-        if player.chips > 0:
-            valid_actions.append({
-                "action_type": ActionType.ALL_IN.value,
-                "min_amount": player.chips,
-                "max_amount": player.chips
-            })
-
-        return valid_actions
-
-    @staticmethod
-    def is_betting_round_complete(game_state: GameState) -> bool:
-        """Check if the current betting round is complete"""
-        active_players = game_state.get_players_to_act()
+    if amount_to_call == 0:
+        # Can check
+        valid_actions.append(_CHECK_ENTRY)
         
-        # If only one player left (others folded/all-in), round is complete
-        if len(active_players) <= 1:
-            return True
-
-        # Check if all active players have acted and matched the current bet
-        for player in active_players:
-            # Player hasn't acted yet
-            if not player.has_acted:
-                return False
+        # Can bet (if has chips)
+        if chips > 0:
+            min_bet = big_blind if big_blind < chips else chips
+            valid_actions.append(ValidAction(_BET_V, min_bet, chips))
+    else:
+        # Can call
+        call_amount = amount_to_call if amount_to_call < chips else chips
+        valid_actions.append(ValidAction(_CALL_V, call_amount, call_amount))
+
+        # Can raise (if has chips beyond call amount)
+        if chips > amount_to_call:
+            min_raise_to = current_bet + min_raise
+            min_raise_amount = min_raise_to - player_bet
+            stack = chips + player_bet  # Most the player can raise to
             
-            # Player hasn't matched current bet (and isn't all-in)
-            if player.current_bet < game_state.current_bet and player.status == PlayerStatus.ACTIVE:
-                return False
-
-        # If there was a raise, check if it came back to the raiser
-        if game_state.last_raiser_id:
-            # Everyone has acted since the last raise
-            raiser = game_state.players.get(game_state.last_raiser_id)
-            if raiser and raiser.has_acted:
-                return True
+            if chips >= min_raise_amount:
+                raise_from = min_raise_to if min_raise_to < stack else stack
+                valid_actions.append(ValidAction(_RAISE_V, raise_from, stack))
+
+    # All-in is always valid if player has chips
+    if chips > 0:
+        valid_actions.append(ValidAction(_ALL_IN_V, chips, chips))
+
+    return tuple(valid_actions)
+
+def is_betting_round_complete(game_state: GameState,
+                              active_players: Optional[List[Player]] = None) -> bool:
+    """Check if the current betting round is complete"""
+    players = game_state.players.values() if active_players is None else active_players
+    current_bet = game_state.current_bet
+    active = PlayerStatus.ACTIVE
+
+    # Single pass: stop at the first player still owing action, as long as
+    # at least two players can act (one player alone always completes it)
+    to_act = 0
+    pending = False
+    for player in players:
+        if player.status is not active:
+            continue
+        to_act += 1
+
+        # Player hasn't acted yet, or hasn't matched the current bet
+        if not player.has_acted or player.current_bet < current_bet:
+            pending = True
+
+        if pending and to_act > 1:
+            return False
+
+    return True
+
+def is_betting_round_complete_fast(game_state: GameState) -> bool:
+    """
+    Same answer as is_betting_round_complete in O(1), from the counters the
+    engine keeps on GameState instead of a scan over the players
+    """
+    if game_state.active_count <= 1:
+        return True
+    return game_state.unacted_count == 0 and game_state.below_bet_count == 0
+
+def is_hand_complete(game_state: GameState) -> bool:
+    """Check if the hand is complete (showdown or everyone folded)"""
+    in_hand = IN_HAND_STATUSES
+    active_players = [
+        p for p in game_state.players.values()
+        if p.status in in_hand
+    ]
+    
+    # Only one player left
+    if len(active_players) <= 1:
+        return True
 
+    # River betting is complete
+    if game_state.betting_round is BettingRound.RIVER and is_betting_round_complete(game_state):
         return True
 
-    @staticmethod
-    def is_hand_complete(game_state: GameState) -> bool:
-        """Check if the hand is complete (showdown or everyone folded)"""
-        active_players = [
-            p for p in game_state.players.values()
-            if p.status in [PlayerStatus.ACTIVE, PlayerStatus.ALL_IN]
-        ]
-        
-        # Only one player left
-        if len(active_players) <= 1:
-            return True
+    return False
 
-        # River betting is complete
-        if game_state.betting_round == game_state.betting_round.RIVER:
-            if RulesEngine.is_betting_round_complete(game_state):
-                return True
 
-        return False
\ No newline at end of file
+class RulesEngine:
+    """
+    Enforces poker rules and validates player actions.
+    A namespace over the module-level rule functions above, kept so existing
+    RulesEngine.<name> callers keep working.
+    """
+    _VALIDATORS = _VALIDATORS
+
+    validate_action = staticmethod(validate_action)
+    _validate_fold = staticmethod(_validate_fold)
+    _validate_check = staticmethod(_validate_check)
+    _validate_call = staticmethod(_validate_call)
+    _validate_bet = staticmethod(_validate_bet)
+    _validate_raise = staticmethod(_validate_raise)
+    _validate_all_in = staticmethod(_validate_all_in)
+    get_valid_actions = staticmethod(get_valid_actions)
+    is_betting_round_complete = staticmethod(is_betting_round_complete)
+    is_betting_round_complete_fast = staticmethod(is_betting_round_complete_fast)
+    is_hand_complete = staticmethod(is_hand_complete)
@@ -3,9 +3,26 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.responses import HTMLResponse, FileResponse
 from fastapi.middleware.cors import CORSMiddleware
 import os
+import asyncio
+import queue
+import logging
+import logging.handlers
 
 from .routes import admin, bot, viewer
 from .config import server_settings, tournament_settings
+from .managers.connection import connection_manager
+
+# App loggers hand records to a queue; a listener thread does the actual
+# writing, so a slow stdout never blocks the event loop
+_log_queue = queue.SimpleQueue()
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s"))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_handler)
+
+app_logger = logging.getLogger("app")
+app_logger.setLevel(logging.DEBUG if server_settings.debug else logging.INFO)
+app_logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+app_logger.propagate = False
 
 # Create FastAPI app
 app = FastAPI(
@@ -23,6 +40,34 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+async def start_log_listener():
+    _log_listener.start()
+
+
+@app.on_event("startup")
+async def use_eager_tasks():
+    # Python 3.12+: new tasks run until their first await before being scheduled,
+    # so action timeouts cancelled by the next action never cost a loop round trip
+    if hasattr(asyncio, "eager_task_factory"):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+
+
+@app.on_event("startup")
+async def start_heartbeat():
+    connection_manager.start_heartbeat()
+
+
+@app.on_event("shutdown")
+async def stop_heartbeat():
+    connection_manager.stop_heartbeat()
+
+
+@app.on_event("shutdown")
+async def stop_log_listener():
+    _log_listener.stop()
+
+
 # Include routers
 app.include_router(bot.router)
 app.include_router(admin.router)
@@ -1,143 +1,449 @@
 import asyncio
 import json
-from typing import Dict, List, Set, Optional
+import logging
+from collections import deque
+from typing import Deque, Dict, List, Optional, Set, Tuple
 from fastapi import WebSocket
 from datetime import datetime
 
+import orjson
+
+try:
+    import msgpack
+except ImportError:  # Optional: only needed for bots that ask for msgpack frames
+    msgpack = None
+
+logger = logging.getLogger(__name__)
+
+# Messages a player's outgoing queue holds before game states start being dropped
+PLAYER_QUEUE_SIZE = 16
+
+# Close code sent to a player socket the server drops (policy violation)
+PLAYER_DROP_CLOSE_CODE = 1008
+
+# Seconds a viewer or admin broadcast send may take before that socket is dropped
+BROADCAST_SEND_TIMEOUT = 0.5
+
+# Seconds between the heartbeats sent to every viewer and admin
+HEARTBEAT_INTERVAL = 15
+
+
+def encode_message(message: dict) -> bytes:
+    """
+    Serialize a message to UTF-8 JSON.
+    Encode once and reuse the result when sending the same message to many sockets.
+    Every frame the server sends, to bots, viewers and admins, is these bytes
+    as-is in a binary frame.
+    """
+    return orjson.dumps(message, option=orjson.OPT_NON_STR_KEYS)
+
+
+# Wire encodings a bot can pick when it connects
+ENCODING_JSON = "json"
+ENCODING_MSGPACK = "msgpack"
+
+
+def encode_msgpack(message: dict) -> bytes:
+    """Serialize a message to msgpack, for bots that connected with encoding=msgpack"""
+    return msgpack.packb(message, use_bin_type=True)
+
+
+# Connection roles, as stored in WebSocketRegistry.role
+ROLE_PLAYER = 0
+ROLE_VIEWER = 1
+ROLE_ADMIN = 2
+ROLE_NAMES = ("player", "viewer", "admin")
+
+
+class WebSocketRegistry:
+    """
+    Every open WebSocket, kept in one plain list per role so a broadcast walks
+    only its own sockets. Player sockets have a parallel list of player ids.
+    Removal moves the last entry of the role's list into the freed slot, so
+    adding and removing are both O(1).
+    """
+    __slots__ = ("ws", "player_ids", "idx_by_ws", "role_by_ws", "idx_by_pid")
+
+    def __init__(self):
+        self.ws: Tuple[List[WebSocket], ...] = ([], [], [])  # Indexed by role
+        self.player_ids: List[str] = []  # Parallel to ws[ROLE_PLAYER]
+        self.idx_by_ws: Dict[WebSocket, int] = {}  # Index within its role's list
+        self.role_by_ws: Dict[WebSocket, int] = {}
+        self.idx_by_pid: Dict[str, int] = {}
+
+    def add(self, websocket: WebSocket, role: int, player_id: Optional[str] = None):
+        """Register a socket; a player's new socket replaces their old one"""
+        if role == ROLE_PLAYER:
+            if player_id in self.idx_by_pid:
+                self.remove_at(ROLE_PLAYER, self.idx_by_pid[player_id])
+            self.idx_by_pid[player_id] = len(self.player_ids)
+            self.player_ids.append(player_id)
+        sockets = self.ws[role]
+        self.idx_by_ws[websocket] = len(sockets)
+        self.role_by_ws[websocket] = role
+        sockets.append(websocket)
+
+    def remove_at(self, role: int, idx: int):
+        """Remove the entry at idx of a role's list by swapping the last entry into its place"""
+        sockets = self.ws[role]
+        websocket = sockets[idx]
+        moved = sockets.pop()
+        if moved is not websocket:
+            sockets[idx] = moved
+            self.idx_by_ws[moved] = idx
+        del self.idx_by_ws[websocket]
+        del self.role_by_ws[websocket]
+
+        if role == ROLE_PLAYER:
+            player_ids = self.player_ids
+            player_id = player_ids[idx]
+            moved_pid = player_ids.pop()
+            if moved_pid != player_id:
+                player_ids[idx] = moved_pid
+                self.idx_by_pid[moved_pid] = idx
+            del self.idx_by_pid[player_id]
+
+    def remove(self, websocket: WebSocket) -> bool:
+        """Remove a socket if registered"""
+        role = self.role_by_ws.get(websocket)
+        if role is None:
+            return False
+        self.remove_at(role, self.idx_by_ws[websocket])
+        return True
+
+    def remove_many(self, role: int, websockets: List[WebSocket]):
+        """
+        Remove several sockets of one role, rebuilding the role's list in a
+        single pass instead of one swap per socket
+        """
+        role_by_ws = self.role_by_ws
+        gone = {ws for ws in websockets if role_by_ws.get(ws) == role}
+        if not gone:
+            return
+        sockets = self.ws[role]
+        keep = [i for i, ws in enumerate(sockets) if ws not in gone]
+        if role == ROLE_PLAYER:
+            for i, ws in enumerate(sockets):
+                if ws in gone:
+                    del self.idx_by_pid[self.player_ids[i]]
+            self.player_ids[:] = [self.player_ids[i] for i in keep]
+            for i, player_id in enumerate(self.player_ids):
+                self.idx_by_pid[player_id] = i
+        sockets[:] = [sockets[i] for i in keep]
+        for ws in gone:
+            del self.idx_by_ws[ws]
+            del role_by_ws[ws]
+        idx_by_ws = self.idx_by_ws
+        for i, ws in enumerate(sockets):
+            idx_by_ws[ws] = i
+
+    def remove_player(self, player_id: str) -> bool:
+        """Remove a player's socket if registered"""
+        idx = self.idx_by_pid.get(player_id)
+        if idx is None:
+            return False
+        self.remove_at(ROLE_PLAYER, idx)
+        return True
+
+    def get_player(self, player_id: str) -> Optional[WebSocket]:
+        """Get a player's socket, None if not connected"""
+        idx = self.idx_by_pid.get(player_id)
+        return None if idx is None else self.ws[ROLE_PLAYER][idx]
+
+    def sockets(self, role: int) -> List[WebSocket]:
+        """Snapshot of every socket with the given role, safe to hold across awaits"""
+        return self.ws[role].copy()
+
+    def count(self, role: int) -> int:
+        """Number of sockets with the given role"""
+        return len(self.ws[role])
+
+
+class PlayerOutbox:
+    """
+    A player's outgoing messages, waiting for their writer task.
+    Entries are (is_game_state, encoded payload); ready is set whenever one is added.
+    """
+    __slots__ = ("messages", "ready")
+
+    def __init__(self):
+        self.messages: Deque[Tuple[bool, bytes]] = deque()
+        self.ready = asyncio.Event()
+
+
 class ConnectionManager:
     """
     Manages WebSocket connections for players and viewers.
     """
 
     def __init__(self):
-        # Player connections: player_id -> WebSocket
-        self.player_connections: Dict[str, WebSocket] = {}
-        # Viewer connections: Set of WebSockets
-        self.viewer_connections: Set[WebSocket] = set()
-        # Admin connections
-        self.admin_connections: Set[WebSocket] = set()
-        # Message queues for players
-        self.player_queues: Dict[str, asyncio.Queue] = {}
-
-    async def connect_player(self, websocket: WebSocket, player_id: str) -> bool:
+        # All player, viewer and admin connections
+        self.registry = WebSocketRegistry()
+        # Outgoing message queues for players, each drained by its own writer task
+        self.player_queues: Dict[str, PlayerOutbox] = {}
+        self.player_writers: Dict[str, asyncio.Task] = {}
+        # Players whose messages are sent as msgpack instead of JSON
+        self.msgpack_players: Set[str] = set()
+        # Shared keepalive timer for viewers and admins, see start_heartbeat()
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        # Pending closes of dropped player sockets, held so they are not garbage collected
+        self._closing: Set[asyncio.Task] = set()
+
+    async def connect_player(self, websocket: WebSocket, player_id: str,
+                             encoding: str = ENCODING_JSON) -> bool:
         """Connect a player WebSocket"""
         await websocket.accept()
-        self.player_connections[player_id] = websocket
-        self.player_queues[player_id] = asyncio.Queue()
-        print(f"[ConnectionManager] Player {player_id} connected")
+        self._drop_player(player_id)  # A reconnect replaces the old socket and writer
+        self.registry.add(websocket, ROLE_PLAYER, player_id)
+        if encoding == ENCODING_MSGPACK:
+            self.msgpack_players.add(player_id)
+        queue = PlayerOutbox()
+        self.player_queues[player_id] = queue
+        self.player_writers[player_id] = asyncio.create_task(
+            self._player_writer(player_id, websocket, queue)
+        )
+        logger.info("Player %s connected", player_id)
         return True
 
-    async def disconnect_player(self, player_id: str):
-        """Disconnect a player"""
-        if player_id in self.player_connections:
-            del self.player_connections[player_id]
-        if player_id in self.player_queues:
-            del self.player_queues[player_id]
-        print(f"[ConnectionManager] Player {player_id} disconnected")
+    async def disconnect_player(self, player_id: str, websocket: Optional[WebSocket] = None):
+        """
+        Disconnect a player whose socket has closed.
+        Pass the socket to leave the player alone if a reconnect has already replaced it.
+        """
+        if websocket is not None and self.registry.get_player(player_id) is not websocket:
+            return
+        self._drop_player(player_id, close=False)
+        logger.info("Player %s disconnected", player_id)
+
+    def _drop_player(self, player_id: str, close: bool = True):
+        """
+        Forget a player's socket and queue, and stop their writer task.
+        With close, the socket is also closed so the bot's route loop ends and it can reconnect.
+        """
+        websocket = self.registry.get_player(player_id)
+        self.registry.remove_player(player_id)
+        self.player_queues.pop(player_id, None)
+        self.msgpack_players.discard(player_id)
+        writer = self.player_writers.pop(player_id, None)
+        if writer is not None and writer is not asyncio.current_task():
+            writer.cancel()
+        if close and websocket is not None:
+            task = asyncio.create_task(self._close_player_socket(player_id, websocket))
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+
+    async def _close_player_socket(self, player_id: str, websocket: WebSocket):
+        """Close a dropped player's socket; it may already be broken"""
+        try:
+            await websocket.close(code=PLAYER_DROP_CLOSE_CODE)
+        except Exception as e:
+            logger.debug("Error closing socket of player %s: %s", player_id, e)
+
+    async def _player_writer(self, player_id: str, websocket: WebSocket, queue: PlayerOutbox):
+        """
+        Send a player's queued messages in order. Of several game states queued
+        back to back only the newest is sent, since it supersedes the rest.
+        """
+        messages = queue.messages
+        try:
+            while True:
+                if not messages:
+                    queue.ready.clear()
+                    await queue.ready.wait()
+                    continue
+                is_state, payload = messages.popleft()
+                while is_state and messages and messages[0][0]:
+                    payload = messages.popleft()[1]
+                await websocket.send_bytes(payload)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("Error sending to player %s: %s", player_id, e)
+            if self.player_writers.get(player_id) is asyncio.current_task():
+                self._drop_player(player_id)
 
     async def connect_viewer(self, websocket: WebSocket) -> bool:
         """Connect a viewer WebSocket"""
         await websocket.accept()
-        self.viewer_connections.add(websocket)
-        print(f"[ConnectionManager] Viewer connected. Total viewers: {len(self.viewer_connections)}")
+        self.registry.add(websocket, ROLE_VIEWER)
+        logger.info("Viewer connected. Total viewers: %d", self.get_viewer_count())
         return True
 
     async def disconnect_viewer(self, websocket: WebSocket):
         """Disconnect a viewer"""
-        self.viewer_connections.discard(websocket)
-        print(f"[ConnectionManager] Viewer disconnected. Total viewers: {len(self.viewer_connections)}")
+        self.registry.remove(websocket)
+        logger.info("Viewer disconnected. Total viewers: %d", self.get_viewer_count())
 
     async def connect_admin(self, websocket: WebSocket) -> bool:
         """Connect an admin WebSocket"""
         await websocket.accept()
-        self.admin_connections.add(websocket)
-        print(f"[ConnectionManager] Admin connected")
+        self.registry.add(websocket, ROLE_ADMIN)
+        logger.info("Admin connected")
         return True
 
     async def disconnect_admin(self, websocket: WebSocket):
         """Disconnect an admin"""
-        self.admin_connections.discard(websocket)
-        print(f"[ConnectionManager] Admin disconnected")
+        self.registry.remove(websocket)
+        logger.info("Admin disconnected")
 
     async def send_to_player(self, player_id: str, message: dict):
         """Send a message to a specific player"""
-        if player_id in self.player_connections:
-            try:
-                ws = self.player_connections[player_id]
-                await ws.send_json(message)
-            except Exception as e:
-                print(f"[ConnectionManager] Error sending to player {player_id}: {e}")
-                await self.disconnect_player(player_id)
+        if player_id in self.player_queues:
+            self._queue_for_player(player_id, self.encode_for_player(player_id, message),
+                                   message.get("type") == "game_state")
+
+    def encode_for_player(self, player_id: str, message: dict) -> bytes:
+        """Encode a message the way a player asked for: UTF-8 JSON, or msgpack"""
+        if player_id in self.msgpack_players:
+            return encode_msgpack(message)
+        return encode_message(message)
+
+    def _queue_for_player(self, player_id: str, payload: bytes, is_state: bool = False):
+        """
+        Queue an already encoded message for a player's writer task.
+        When the queue is full a new game state takes the place of the oldest
+        queued one; if there is none to replace, the client has stalled and is disconnected.
+        """
+        queue = self.player_queues.get(player_id)
+        if queue is None:
+            return
+        messages = queue.messages
+        if len(messages) >= PLAYER_QUEUE_SIZE:
+            stale = None
+            if is_state:
+                stale = next((i for i, (queued_state, _) in enumerate(messages) if queued_state), None)
+            if stale is None:
+                logger.warning("Player %s is not reading messages, disconnecting", player_id)
+                self._drop_player(player_id)
+                return
+            del messages[stale]  # Superseded by the state being queued
+        messages.append((is_state, payload))
+        queue.ready.set()
 
     async def send_to_all_players(self, message: dict, player_ids: Optional[List[str]] = None):
         """Send a message to multiple players"""
-        targets = player_ids if player_ids else list(self.player_connections.keys())
+        targets = player_ids if player_ids else list(self.player_queues)
+        payload = encode_message(message)
+        packed = None  # msgpack form, encoded once if any target wants it
+        msgpack_players = self.msgpack_players
+        is_state = message.get("type") == "game_state"
         for pid in targets:
-            await self.send_to_player(pid, message)
+            if pid in msgpack_players:
+                if packed is None:
+                    packed = encode_msgpack(message)
+                self._queue_for_player(pid, packed, is_state)
+            else:
+                self._queue_for_player(pid, payload, is_state)
 
     async def broadcast_to_viewers(self, message: dict):
         """Broadcast a message to all viewers"""
-        disconnected = []
-        for websocket in self.viewer_connections:
-            try:
-                await websocket.send_json(message)
-            except Exception as e:
-                print(f"[ConnectionManager] Error broadcasting to viewer: {e}")
-                disconnected.append(websocket)
-        
-        for ws in disconnected:
-            self.viewer_connections.discard(ws)
+        await self._broadcast_bytes(ROLE_VIEWER, encode_message(message))
 
     async def broadcast_to_admins(self, message: dict):
         """Broadcast a message to all admins"""
-        disconnected = []
-        for websocket in self.admin_connections:
-            try:
-                await websocket.send_json(message)
-            except Exception as e:
-                print(f"[ConnectionManager] Error broadcasting to admin: {e}")
-                disconnected.append(websocket)
-        
-        for ws in disconnected:
-            self.admin_connections.discard(ws)
+        await self._broadcast_bytes(ROLE_ADMIN, encode_message(message))
+
+    async def _broadcast_bytes(self, role: int, payload: bytes):
+        """
+        Send an already encoded message to every socket of a role as a binary
+        frame, so the same bytes go out without re-encoding per socket.
+        Sends run concurrently so one slow socket does not hold up the rest,
+        and each is given BROADCAST_SEND_TIMEOUT so a dead peer cannot stall
+        the caller; sockets that fail or time out are removed together afterwards.
+        """
+        sockets = self.registry.sockets(role)
+        if not sockets:
+            return
+        results = await asyncio.gather(
+            *(asyncio.wait_for(websocket.send_bytes(payload), BROADCAST_SEND_TIMEOUT)
+              for websocket in sockets),
+            return_exceptions=True
+        )
+
+        failed = []
+        for ws, result in zip(sockets, results):
+            if isinstance(result, Exception):
+                logger.warning("Error broadcasting to %s: %r", ROLE_NAMES[role], result)
+                failed.append(ws)
+        if failed:
+            self.registry.remove_many(role, failed)
 
     async def broadcast_game_state(self, game_engine, player_ids: List[str]):
         """Broadcast game state to all relevant parties"""
-        # Send personalized state to each player
-        for pid in player_ids:
-            player_state = game_engine.get_state_for_player(pid)
-            await self.send_to_player(pid, {
+        sends = []
+        timestamp = datetime.now().isoformat()  # One timestamp for the whole broadcast
+
+        # Build the public state once; each player's state only overlays their private fields
+        connected = self.registry.idx_by_pid
+        connected_ids = [pid for pid in player_ids if pid in connected]
+        public_state, overlays = game_engine.get_broadcast_payloads(connected_ids)
+
+        # Queue personalized state for each player
+        for pid in connected_ids:
+            self._queue_for_player(pid, self.encode_for_player(pid, {
                 "type": "game_state",
-                "data": player_state,
-                "timestamp": datetime.now().isoformat()
-            })
+                "data": {**public_state, **overlays[pid]},
+                "timestamp": timestamp
+            }), is_state=True)
 
-        # Send public state to viewers
-        public_state = game_engine.get_public_state()
-        await self.broadcast_to_viewers({
+        # Public state is encoded once and shared by viewers and admins
+        payload = encode_message({
             "type": "game_state",
             "data": public_state,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": timestamp
         })
+        sends.append(self._broadcast_bytes(ROLE_VIEWER, payload))
+        sends.append(self._broadcast_bytes(ROLE_ADMIN, payload))
 
-        # Send to admins as well
-        await self.broadcast_to_admins({
-            "type": "game_state",
-            "data": public_state,
-            "timestamp": datetime.now().isoformat()
-        })
+        # Every send helper handles its own errors, so nothing is raised here
+        await asyncio.gather(*sends)
+
+    def start_heartbeat(self):
+        """Start the shared heartbeat; clients that stop hearing it treat the connection as dead"""
+        if self._heartbeat_task is None or self._heartbeat_task.done():
+            self._heartbeat_task = asyncio.create_task(self._heartbeat())
+
+    def stop_heartbeat(self):
+        """Stop the shared heartbeat"""
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            self._heartbeat_task = None
+
+    async def _heartbeat(self):
+        """
+        One timer for every viewer and admin, instead of each client pinging
+        and being answered on its own. Each beat is encoded once.
+        """
+        while True:
+            await asyncio.sleep(HEARTBEAT_INTERVAL)
+            payload = encode_message({
+                "type": "heartbeat",
+                "timestamp": datetime.now().isoformat()
+            })
+            await asyncio.gather(
+                self._broadcast_bytes(ROLE_VIEWER, payload),
+                self._broadcast_bytes(ROLE_ADMIN, payload)
+            )
+
+    def has_listeners(self, player_ids: List[str]) -> bool:
+        """Whether a game state broadcast for these players would reach anyone"""
+        registry = self.registry
+        if registry.ws[ROLE_VIEWER] or registry.ws[ROLE_ADMIN]:
+            return True
+        connected = registry.idx_by_pid
+        return any(pid in connected for pid in player_ids)
 
     def is_player_connected(self, player_id: str) -> bool:
         """Check if a player is connected"""
-        return player_id in self.player_connections
+        return player_id in self.registry.idx_by_pid
 
     def get_connected_player_count(self) -> int:
         """Get number of connected players"""
-        return len(self.player_connections)
+        return self.registry.count(ROLE_PLAYER)
 
     def get_viewer_count(self) -> int:
         """Get number of connected viewers"""
-        return len(self.viewer_connections)
+        return self.registry.count(ROLE_VIEWER)
 
 
 # Global connection manager instance
@@ -1,7 +1,10 @@
 import asyncio
+import base64
+import heapq
 import uuid
 import secrets
-from typing import Dict, List, Optional
+from operator import itemgetter
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from enum import Enum
 
@@ -11,6 +14,9 @@ from ..models.game import ActionType, PlayerAction, GamePhase
 from ..engine.game_engine import PokerGameEngine
 from .connection import connection_manager
 
+# Registration tokens are read from the OS this many at a time
+TOKEN_BATCH_SIZE = 256
+
 class TournamentStatus(str, Enum):
     REGISTRATION = "registration"
     RUNNING = "running"
@@ -31,10 +37,13 @@ class TournamentManager:
         # Player management
         self.registered_players: Dict[str, dict] = {}  # player_id -> {username, api_key, ...}
         self.api_keys: Dict[str, str] = {}  # api_key -> player_id
+        self.usernames_lower: Dict[str, str] = {}  # lowercased username -> player_id
+        self._token_pool: List[Tuple[str, str]] = []  # Unused (player_id suffix, api_key) pairs
         
         # Table/Game management
         self.tables: Dict[str, PokerGameEngine] = {}  # table_id -> game engine
         self.player_table_map: Dict[str, str] = {}  # player_id -> table_id
+        self.player_engines: Dict[str, PokerGameEngine] = {}  # player_id -> their table's engine
         
         # Tournament stats
         self.start_time: Optional[datetime] = None
@@ -45,10 +54,21 @@ class TournamentManager:
         self.current_blind_level: int = 1
         self.small_blind: int = config.small_blind
         self.big_blind: int = config.big_blind
+        self._blind_schedule: List[Tuple[int, int]] = [(config.small_blind, config.big_blind)]  # Level - 1 -> blinds
 
         # Action timeout task
         self._timeout_tasks: Dict[str, asyncio.Task] = {}
 
+        # Eliminated usernames waiting to go out in the next elimination broadcast
+        self._elimination_buffer: List[str] = []
+        self._elimination_flush: Optional[asyncio.Task] = None
+
+        # Snapshots for the polled player/table listings, cleared whenever
+        # players, tables or the tournament status change
+        self._player_list_cache: Optional[List[dict]] = None
+        self._table_states_cache: Optional[List[dict]] = None
+        self._leaderboard_cache: Optional[List[dict]] = None
+
         print(f"[TournamentManager] Tournament '{config.name}' created with ID: {self.tournament_id}")
 
     def register_player(self, username: str, team_name: Optional[str] = None) -> dict:
@@ -60,15 +80,15 @@ class TournamentManager:
             }
 
         # Check for duplicate username
-        for player_info in self.registered_players.values():
-            if player_info["username"].lower() == username.lower():
-                return {
-                    "success": False,
-                    "message": f"Username '{username}' is already taken"
-                }
+        username_lower = username.lower()
+        if username_lower in self.usernames_lower:
+            return {
+                "success": False,
+                "message": f"Username '{username}' is already taken"
+            }
 
-        player_id = f"player_{len(self.registered_players) + 1}_{secrets.token_hex(4)}"
-        api_key = secrets.token_urlsafe(32)
+        id_suffix, api_key = self._next_tokens()
+        player_id = f"player_{len(self.registered_players) + 1}_{id_suffix}"
 
         self.registered_players[player_id] = {
             "username": username,
@@ -78,6 +98,8 @@ class TournamentManager:
             "status": "registered"
         }
         self.api_keys[api_key] = player_id
+        self.usernames_lower[username_lower] = player_id
+        self._invalidate_snapshots()
 
         print(f"[TournamentManager] Player '{username}' registered with ID: {player_id}")
 
@@ -88,6 +110,20 @@ class TournamentManager:
             "message": f"Successfully registered as '{username}'"
         }
 
+    def _next_tokens(self) -> Tuple[str, str]:
+        """
+        Get a fresh (player_id suffix, api_key) pair, the same shapes as
+        secrets.token_hex(4) and secrets.token_urlsafe(32). Random bytes for a
+        whole batch are read at once, so a signup burst costs one read per batch.
+        """
+        if not self._token_pool:
+            raw = secrets.token_bytes(TOKEN_BATCH_SIZE * 36)
+            self._token_pool = [
+                (raw[i:i + 4].hex(), base64.urlsafe_b64encode(raw[i + 4:i + 36]).rstrip(b"=").decode("ascii"))
+                for i in range(0, len(raw), 36)
+            ]
+        return self._token_pool.pop()
+
     def authenticate_player(self, api_key: str) -> Optional[str]:
         """Authenticate a player by API key, return player_id if valid"""
         return self.api_keys.get(api_key)
@@ -118,6 +154,7 @@ class TournamentManager:
 
         self.status = TournamentStatus.RUNNING
         self.start_time = datetime.now()
+        self._invalidate_snapshots()
 
         # Create tables and assign players
         await self._create_tables()
@@ -176,7 +213,7 @@ class TournamentManager:
                     chips=self.config.starting_chips,
                     seat=seat
                 )
-                self.player_table_map[player_id] = table_id
+                self.seat_player(player_id, table_id, game_engine)
 
             self.tables[table_id] = game_engine
             print(f"[TournamentManager] Created {table_id} with players: {[self.get_player_username(p) for p in table_players]}")
@@ -196,36 +233,29 @@ class TournamentManager:
             }
 
         # Find player's table
-        table_id = self.player_table_map.get(player_id)
-        if not table_id:
-            return {
-                "success": False,
-                "message": "Player not assigned to any table"
-            }
-
-        game_engine = self.tables.get(table_id)
+        game_engine = self.player_engines.get(player_id)
         if not game_engine:
             return {
                 "success": False,
-                "message": "Table not found"
+                "message": "Player not assigned to any table"
             }
-
-        # Cancel existing timeout
-        self._cancel_action_timeout(table_id)
+        table_id = game_engine.game_state.table_id
 
         # Create and process the action
         action = PlayerAction(action_type=action_type, amount=amount)
         result = game_engine.process_action(player_id, action)
 
         if not result.is_valid:
-            # Restart timeout since action was invalid
-            self._start_action_timeout(table_id)
+            # Nothing changed, so the running timeout still applies
             return {
                 "success": False,
                 "message": result.error_message,
                 "valid_actions": game_engine.get_valid_actions(player_id)
             }
 
+        # The acting player's timeout is over; the next one starts below
+        self._cancel_action_timeout(table_id)
+
         # Broadcast updated state
         await self._broadcast_table_state(table_id)
 
@@ -268,17 +298,13 @@ class TournamentManager:
 
         # Remove eliminated players from table map
         for player_id in eliminated:
-            self.player_table_map.pop(player_id, None)
+            self.unseat_player(player_id)
 
-        # Broadcast elimination notifications
+        # Broadcast elimination notifications, batched with other tables' for this tick
         if eliminated:
-            await connection_manager.broadcast_to_viewers({
-                "type": "elimination",
-                "data": {
-                    "eliminated": [self.get_player_username(p) for p in eliminated],
-                    "remaining_players": self._get_remaining_player_count()
-                }
-            })
+            self._elimination_buffer.extend(self.get_player_username(p) for p in eliminated)
+            if self._elimination_flush is None:
+                self._elimination_flush = asyncio.create_task(self._flush_eliminations())
 
         # Check for tournament winner
         remaining = self._get_remaining_player_count()
@@ -313,15 +339,16 @@ class TournamentManager:
         if not game_engine:
             return
 
-        # Get remaining players from this table
-        remaining_players = [
+        # Get remaining players from this table (its engine is not touched again)
+        remaining_players = (
             (pid, player.chips)
             for pid, player in game_engine.game_state.players.items()
             if player.chips > 0
-        ]
+        )
 
         # Remove the table
         del self.tables[table_id]
+        self._invalidate_snapshots()
         print(f"[TournamentManager] Closed {table_id}")
 
         # If no other tables, tournament is over
@@ -329,13 +356,18 @@ class TournamentManager:
             await self._end_tournament()
             return
 
-        # Redistribute players to other tables
+        # Redistribute players to other tables, via a min-heap of
+        # (players seated, table order, table_id) so ties go to the earlier table
+        table_heap = [
+            (len(engine.game_state.players), order, tid)
+            for order, (tid, engine) in enumerate(self.tables.items())
+        ]
+        heapq.heapify(table_heap)
+
+        notifications = []
         for player_id, chips in remaining_players:
             # Find table with fewest players
-            target_table_id = min(
-                self.tables.keys(),
-                key=lambda tid: len(self.tables[tid].game_state.players)
-            )
+            seated, order, target_table_id = heapq.heappop(table_heap)
             target_engine = self.tables[target_table_id]
 
             # Add player to new table
@@ -345,17 +377,20 @@ class TournamentManager:
                 username=player_info["username"],
                 chips=chips
             )
-            self.player_table_map[player_id] = target_table_id
+            self.seat_player(player_id, target_table_id, target_engine)
+            heapq.heappush(table_heap, (len(target_engine.game_state.players), order, target_table_id))
             print(f"[TournamentManager] Moved {player_info['username']} to {target_table_id}")
 
             # Notify player
-            await connection_manager.send_to_player(player_id, {
+            notifications.append(connection_manager.send_to_player(player_id, {
                 "type": "table_change",
                 "data": {
                     "new_table_id": target_table_id,
                     "message": "You have been moved to a new table"
                 }
-            })
+            }))
+
+        await asyncio.gather(*notifications)
 
     def _check_blind_increase(self):
         """Check if blinds should increase"""
@@ -367,21 +402,50 @@ class TournamentManager:
         
         if expected_level > self.current_blind_level:
             self.current_blind_level = expected_level
-            multiplier = self.config.blind_increase_multiplier ** (self.current_blind_level - 1)
-            
-            self.small_blind = int(self.config.small_blind * multiplier)
-            self.big_blind = int(self.config.big_blind * multiplier)
+
+            # Blinds for each level are worked out once, the first time it is reached
+            schedule = self._blind_schedule
+            config = self.config
+            while len(schedule) < expected_level:
+                multiplier = config.blind_increase_multiplier ** len(schedule)
+                schedule.append((int(config.small_blind * multiplier), int(config.big_blind * multiplier)))
+            self.small_blind, self.big_blind = schedule[expected_level - 1]
 
             # Update all tables
             for game_engine in self.tables.values():
                 game_engine.game_state.small_blind = self.small_blind
                 game_engine.game_state.big_blind = self.big_blind
+                game_engine.game_state.mark_changed()
+            self._invalidate_snapshots()
 
             print(f"[TournamentManager] Blinds increased to {self.small_blind}/{self.big_blind}")
 
+    async def _flush_eliminations(self):
+        """Wait one tick, then send every elimination buffered meanwhile as one message"""
+        await asyncio.sleep(0)
+        self._elimination_flush = None
+        await self._send_eliminations()
+
+    async def _send_eliminations(self):
+        """Send buffered eliminations to viewers, if there are any"""
+        if not self._elimination_buffer:
+            return
+        eliminated, self._elimination_buffer = self._elimination_buffer, []
+        await connection_manager.broadcast_to_viewers({
+            "type": "elimination",
+            "data": {
+                "eliminated": eliminated,
+                "remaining_players": self._get_remaining_player_count()
+            }
+        })
+
     async def _end_tournament(self):
         """End the tournament and determine final standings"""
         self.status = TournamentStatus.FINISHED
+        self._invalidate_snapshots()
+
+        # Viewers hear about the last eliminations before the final result
+        await self._send_eliminations()
 
         # Determine winner
         winner = None
@@ -425,10 +489,11 @@ class TournamentManager:
         }
 
         # Broadcast to everyone
-        await connection_manager.broadcast_to_viewers(result)
-        await connection_manager.broadcast_to_admins(result)
-        for player_id in self.registered_players:
-            await connection_manager.send_to_player(player_id, result)
+        await asyncio.gather(
+            connection_manager.broadcast_to_viewers(result),
+            connection_manager.broadcast_to_admins(result),
+            connection_manager.send_to_all_players(result, list(self.registered_players))
+        )
 
         print(f"[TournamentManager] Tournament complete! Winner: {winner['username'] if winner else 'None'}")
 
@@ -438,7 +503,13 @@ class TournamentManager:
         if not game_engine:
             return
 
+        # Every table change is broadcast, so this is where snapshots go stale
+        self._invalidate_snapshots()
+
+        # Skip building and encoding the state when nobody would receive it
         player_ids = list(game_engine.game_state.players.keys())
+        if not connection_manager.has_listeners(player_ids):
+            return
         await connection_manager.broadcast_game_state(game_engine, player_ids)
 
     def _start_action_timeout(self, table_id: str):
@@ -468,18 +539,36 @@ class TournamentManager:
 
     def _cancel_action_timeout(self, table_id: str):
         """Cancel the action timeout for a table"""
-        if table_id in self._timeout_tasks:
-            self._timeout_tasks[table_id].cancel()
-            del self._timeout_tasks[table_id]
+        task = self._timeout_tasks.pop(table_id, None)
+        # A timeout that fired is finishing its own auto-fold; don't interrupt it
+        if task is not None and task is not asyncio.current_task():
+            task.cancel()
+
+    def _cancel_all_action_timeouts(self):
+        """Cancel and forget every table's action timeout"""
+        timeout_tasks = self._timeout_tasks
+        while timeout_tasks:
+            _, task = timeout_tasks.popitem()
+            task.cancel()
+
+    def seat_player(self, player_id: str, table_id: str, game_engine: PokerGameEngine):
+        """Record which table, and engine, a player is playing at"""
+        self.player_table_map[player_id] = table_id
+        self.player_engines[player_id] = game_engine
+
+    def unseat_player(self, player_id: str):
+        """Forget a player's table, if they had one"""
+        self.player_table_map.pop(player_id, None)
+        self.player_engines.pop(player_id, None)
+        self._invalidate_snapshots()
 
     def _get_remaining_player_count(self) -> int:
-        """Get count of players still in tournament"""
-        remaining = 0
-        for game_engine in self.tables.values():
-            for player in game_engine.game_state.players.values():
-                if player.chips > 0:
-                    remaining += 1
-        return remaining
+        """
+        Get count of players still in tournament.
+        Seated players leave player_table_map exactly when they are eliminated
+        or kicked, so its size is the count without scanning every table.
+        """
+        return len(self.player_table_map)
 
     def pause_tournament(self) -> dict:
         """Pause the tournament"""
@@ -487,10 +576,10 @@ class TournamentManager:
             return {"success": False, "message": "Tournament is not running"}
 
         self.status = TournamentStatus.PAUSED
+        self._invalidate_snapshots()
         
         # Cancel all timeouts
-        for table_id in list(self._timeout_tasks.keys()):
-            self._cancel_action_timeout(table_id)
+        self._cancel_all_action_timeouts()
 
         return {"success": True, "message": "Tournament paused"}
 
@@ -500,6 +589,7 @@ class TournamentManager:
             return {"success": False, "message": "Tournament is not paused"}
 
         self.status = TournamentStatus.RUNNING
+        self._invalidate_snapshots()
 
         # Restart timeouts for current players
         for table_id in self.tables:
@@ -532,49 +622,88 @@ class TournamentManager:
             "eliminations": self.eliminations[-10:]  # Last 10 eliminations
         }
 
+    def _invalidate_snapshots(self):
+        """Drop the cached player list, table states and leaderboard"""
+        self._player_list_cache = None
+        self._table_states_cache = None
+        self._leaderboard_cache = None
+
     def get_player_list(self) -> List[dict]:
         """Get list of all registered players"""
+        players = self._player_list_cache
+        if players is None:
+            players = self._player_list_cache = self._build_player_list()
+
+        # Connections come and go without the tournament hearing of it
+        is_connected = connection_manager.is_player_connected
+        return [{**p, "connected": is_connected(p["player_id"])} for p in players]
+
+    def _build_player_list(self) -> List[dict]:
+        """Build the player list, without connection status"""
         players = []
         for player_id, info in self.registered_players.items():
             player_data = {
                 "player_id": player_id,
                 "username": info["username"],
                 "team_name": info.get("team_name"),
-                "registered_at": info["registered_at"],
-                "connected": connection_manager.is_player_connected(player_id)
+                "registered_at": info["registered_at"]
             }
 
             # Add chip count if tournament is running
             if self.status == TournamentStatus.RUNNING:
-                table_id = self.player_table_map.get(player_id)
-                if table_id and table_id in self.tables:
-                    game_engine = self.tables[table_id]
+                game_engine = self.player_engines.get(player_id)
+                if game_engine:
                     player = game_engine.game_state.players.get(player_id)
                     if player:
                         player_data["chips"] = player.chips
-                        player_data["table_id"] = table_id
+                        player_data["table_id"] = game_engine.game_state.table_id
                         player_data["status"] = player.status.value
 
             players.append(player_data)
 
         return players
 
+    def get_leaderboard(self) -> List[dict]:
+        """Get players with chips, most chips first (a shared snapshot, not to be modified)"""
+        if self._leaderboard_cache is not None:
+            return self._leaderboard_cache
+
+        players = self._player_list_cache
+        if players is None:
+            players = self._player_list_cache = self._build_player_list()
+
+        ranked = sorted(
+            (p for p in players if p.get("chips", 0) > 0),
+            key=itemgetter("chips"),
+            reverse=True
+        )
+        self._leaderboard_cache = [
+            {
+                "position": i + 1,
+                "username": p["username"],
+                "chips": p["chips"],
+                "table_id": p.get("table_id")
+            }
+            for i, p in enumerate(ranked)
+        ]
+        return self._leaderboard_cache
+
     def get_table_states(self) -> List[dict]:
-        """Get states of all active tables"""
+        """Get states of all active tables (a shared snapshot, not to be modified)"""
+        if self._table_states_cache is not None:
+            return self._table_states_cache
+
         table_states = []
         for table_id, game_engine in self.tables.items():
             state = game_engine.get_public_state()
             state["table_id"] = table_id
             table_states.append(state)
+        self._table_states_cache = table_states
         return table_states
 
     def get_player_game_state(self, player_id: str) -> Optional[dict]:
         """Get game state for a specific player"""
-        table_id = self.player_table_map.get(player_id)
-        if not table_id:
-            return None
-
-        game_engine = self.tables.get(table_id)
+        game_engine = self.player_engines.get(player_id)
         if not game_engine:
             return None
 
@@ -594,16 +723,16 @@ class TournamentManager:
         })
 
         # Remove from table if in game
-        table_id = self.player_table_map.get(player_id)
-        if table_id and table_id in self.tables:
-            game_engine = self.tables[table_id]
+        game_engine = self.player_engines.get(player_id)
+        if game_engine:
             if player_id in game_engine.game_state.players:
                 player = game_engine.game_state.players[player_id]
                 player.status = PlayerStatus.FOLDED
                 player.chips = 0
+                game_engine.refresh_round_counters()
 
         # Remove from player maps
-        self.player_table_map.pop(player_id, None)
+        self.unseat_player(player_id)
         
         # Add to eliminations
         self.eliminations.append({
@@ -619,19 +748,21 @@ class TournamentManager:
     def reset_tournament(self) -> dict:
         """Reset the tournament for a new run"""
         # Cancel all timeout tasks
-        for table_id in list(self._timeout_tasks.keys()):
-            self._cancel_action_timeout(table_id)
+        self._cancel_all_action_timeouts()
 
         # Clear all state
         self.status = TournamentStatus.REGISTRATION
         self.tables.clear()
         self.player_table_map.clear()
+        self.player_engines.clear()
         self.eliminations.clear()
+        self._elimination_buffer.clear()
         self.hands_played = 0
         self.start_time = None
         self.current_blind_level = 1
         self.small_blind = self.config.small_blind
         self.big_blind = self.config.big_blind
+        self._invalidate_snapshots()
 
         # Keep registered players but reset their status
         for player_info in self.registered_players.values():
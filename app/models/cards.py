@@ -1,7 +1,7 @@
 # app/models/cards.py
 from enum import IntEnum, Enum
-from pydantic import BaseModel
-from typing import List
+from dataclasses import dataclass, field
+from typing import List, Tuple
 import random
 
 class Suit(str, Enum):
@@ -27,72 +27,117 @@ class Rank(IntEnum):
 
     @classmethod
     def from_char(cls, char: str) -> 'Rank':
-        mapping = {
-            '2': cls.TWO, '3': cls.THREE, '4': cls.FOUR, '5': cls.FIVE,
-            '6': cls.SIX, '7': cls.SEVEN, '8': cls.EIGHT, '9': cls.NINE,
-            'T': cls.TEN, 'J': cls.JACK, 'Q': cls.QUEEN, 'K': cls.KING, 'A': cls.ACE
-        }
-        return mapping[char.upper()]
+        return _RANK_FROM_CHAR[char.upper()]
 
     def to_char(self) -> str:
-        if self.value <= 9:
-            return str(self.value)
-        return {10: 'T', 11: 'J', 12: 'Q', 13: 'K', 14: 'A'}[self.value]
+        return _RANK_TO_CHAR[self - 2]
 
-class Card(BaseModel):
+# Enum members in card-index order, so nothing iterates the enums after import
+_RANKS: Tuple[Rank, ...] = tuple(Rank)
+_SUITS: Tuple[Suit, ...] = (Suit.CLUBS, Suit.DIAMONDS, Suit.HEARTS, Suit.SPADES)
+
+# Rank characters, indexed by rank - 2
+_RANK_TO_CHAR = ('2', '3', '4', '5', '6', '7', '8', '9', 'T', 'J', 'Q', 'K', 'A')
+_RANK_FROM_CHAR = {char: _RANKS[i] for i, char in enumerate(_RANK_TO_CHAR)}
+
+# Suit positions in a card index
+_SUIT_INDEX = {suit: i for i, suit in enumerate(_SUITS)}
+
+# Card strings such as "Ah", by card index
+_CARD_STRS: Tuple[str, ...] = tuple(
+    _RANK_TO_CHAR[rank - 2] + suit.value for rank in _RANKS for suit in _SUITS
+)
+
+# JSON form of each card, by card index. Shared by every serialized state,
+# so these dicts must never be modified.
+CARD_JSON: Tuple[dict, ...] = tuple(
+    {"rank": _RANK_TO_CHAR[rank - 2], "suit": suit.value} for rank in _RANKS for suit in _SUITS
+)
+
+@dataclass(frozen=True, slots=True)
+class Card:
     rank: Rank
     suit: Suit
+    # Position in ALL_CARDS, (rank - 2) * 4 + suit position; doubles as the hash
+    index: int = field(init=False, repr=False, compare=False)
 
-    def __str__(self) -> str:
-        return f"{self.rank.to_char()}{self.suit.value}"
+    def __post_init__(self):
+        object.__setattr__(self, "index", (self.rank - 2) * 4 + _SUIT_INDEX[self.suit])
 
-    def __hash__(self):
-        return hash((self.rank, self.suit))
+    def __hash__(self) -> int:
+        return self.index
 
-    def __eq__(self, other):
-        if isinstance(other, Card):
-            return self.rank == other.rank and self.suit == other.suit
-        return False
+    def __str__(self) -> str:
+        return _CARD_STRS[self.index]
 
     def to_dict(self) -> dict:
-        return {"rank": self.rank.to_char(), "suit": self.suit.value}
+        """A fresh JSON dict; serializers share the read-only CARD_JSON entries instead"""
+        return dict(CARD_JSON[self.index])
 
     @classmethod
     def from_string(cls, s: str) -> 'Card':
-        return cls(rank=Rank.from_char(s[0]), suit=Suit(s[1].lower()))
+        card = _CARDS_BY_STR.get(s[0].upper() + s[1].lower())
+        if card is None:  # Let the enums raise their usual errors
+            return cls(rank=Rank.from_char(s[0]), suit=Suit(s[1].lower()))
+        return card
+
+# Every card, built once and shared by all decks.
+# A card's index is (rank - 2) * 4 + suit position (clubs, diamonds, hearts, spades).
+ALL_CARDS: Tuple[Card, ...] = tuple(
+    Card(rank=rank, suit=suit)
+    for rank in _RANKS
+    for suit in _SUITS
+)
+_CARDS_BY_STR = {_CARD_STRS[card.index]: card for card in ALL_CARDS}
+
+# Card indexes in table order, the starting point of every shuffle
+_UNSHUFFLED = bytes(range(len(ALL_CARDS)))
 
 class Deck:
-    """Standard 52-card deck"""
+    """
+    Standard 52-card deck.
+    The shuffled order is kept as one byte per card (its ALL_CARDS index);
+    cards are looked up only as they are dealt.
+    """
     
     def __init__(self):
-        self.cards: List[Card] = []
+        self._order = bytearray()
+        self._idx = 0  # Position of the next card to deal
         self.reset()
 
     def reset(self):
         """Reset and shuffle the deck"""
-        self.cards = [
-            Card(rank=rank, suit=suit)
-            for suit in Suit
-            for rank in Rank
-        ]
+        self._order = bytearray(_UNSHUFFLED)
+        self._idx = 0
         self.shuffle()
 
     def shuffle(self):
-        """Shuffle the deck"""
-        random.shuffle(self.cards)
+        """Shuffle the cards not yet dealt"""
+        tail = self._order[self._idx:]
+        random.shuffle(tail)
+        self._order[self._idx:] = tail
 
     def deal(self, count: int = 1) -> List[Card]:
         """Deal cards from the deck"""
-        if len(self.cards) < count:
+        idx = self._idx
+        if len(self._order) - idx < count:
             raise ValueError("Not enough cards in deck")
-        dealt = self.cards[:count]
-        self.cards = self.cards[count:]
-        return dealt
+        self._idx = idx + count
+        return [ALL_CARDS[i] for i in self._order[idx:idx + count]]
 
     def deal_one(self) -> Card:
         """Deal a single card"""
-        return self.deal(1)[0]
+        idx = self._idx
+        if idx >= len(self._order):
+            raise ValueError("Not enough cards in deck")
+        self._idx = idx + 1
+        return ALL_CARDS[self._order[idx]]
+
+    @property
+    def cards(self) -> List[Card]:
+        """Cards not yet dealt, in dealing order"""
+        return [ALL_CARDS[i] for i in self._order[self._idx:]]
 
     @property
     def remaining(self) -> int:
-        return len(self.cards)
\ No newline at end of file
+        return len(self._order) - self._idx
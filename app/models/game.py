@@ -1,9 +1,11 @@
 # app/models/game.py
-from pydantic import BaseModel, Field
-from typing import List, Dict, Optional
+from collections import deque
+from dataclasses import dataclass, field
+from pydantic import BaseModel, Field, PrivateAttr
+from typing import Deque, List, Dict, Optional, Tuple
 from enum import Enum
-from .cards import Card
-from .player import Player, PlayerStatus
+from .cards import Card, CARD_JSON
+from .player import Player, PlayerStatus, IN_HAND_STATUSES
 
 class BettingRound(str, Enum):
     PREFLOP = "preflop"
@@ -27,27 +29,40 @@ class ActionType(str, Enum):
     RAISE = "raise"
     ALL_IN = "all_in"
 
-class PlayerAction(BaseModel):
-    """Action submitted by a player"""
+@dataclass(slots=True)
+class PlayerAction:
+    """
+    Action submitted by a player.
+    This and the two classes below are plain slots dataclasses rather than
+    pydantic models: they are built for every action from already checked values.
+    """
     action_type: ActionType
     amount: Optional[int] = None
 
-class ValidatedAction(BaseModel):
+@dataclass(slots=True)
+class ValidatedAction:
     """Server-validated action result"""
     player_id: str
     action_type: ActionType
     amount: int = 0
-    is_valid: bool
+    is_valid: bool = True
     error_message: Optional[str] = None
 
-class PotInfo(BaseModel):
+@dataclass(slots=True)
+class PotInfo:
     """Information about a pot (main or side)"""
     amount: int = 0
-    eligible_players: List[str] = Field(default_factory=list)
+    eligible_players: List[str] = field(default_factory=list)
+
+# Field names for the rows stored in GameState.action_history
+ACTION_HISTORY_FIELDS = ("player_id", "username", "action", "amount", "round", "timestamp_ns")
+
+# Most recent actions included in the public state
+RECENT_ACTIONS = 10
 
 class GameState(BaseModel):
     """Complete game state"""
-    game_id: str
+    game_id: int              # Serialized as a 32-digit hex string
     table_id: str
     hand_number: int = 0
     phase: GamePhase = GamePhase.WAITING
@@ -61,45 +76,139 @@ class GameState(BaseModel):
     
     current_player_id: Optional[str] = None
     dealer_position: int = 0
+    small_blind_id: Optional[str] = None
+    big_blind_id: Optional[str] = None
     
     small_blind: int = 10
     big_blind: int = 20
     current_bet: int = 0      # Current bet to match
     min_raise: int = 0        # Minimum raise amount
     last_raiser_id: Optional[str] = None
+
+    # Betting-round counters over ACTIVE players, kept by the engine:
+    # how many there are, how many have not acted, how many are below current_bet
+    active_count: int = 0
+    unacted_count: int = 0
+    below_bet_count: int = 0
     
-    action_history: List[Dict] = Field(default_factory=list)
+    # Compact rows, see ACTION_HISTORY_FIELDS; expanded to dicts on output
+    action_history: List[Tuple] = Field(default_factory=list)
     hand_winners: List[Dict] = Field(default_factory=list)
 
+    # Sum of all pot amounts, kept up to date by the pot methods below
+    _total_pot: int = PrivateAttr(default=0)
+
+    # The last RECENT_ACTIONS rows of action_history, already expanded to dicts
+    _recent_actions: Deque[Dict] = PrivateAttr(default_factory=lambda: deque(maxlen=RECENT_ACTIONS))
+
+    # Bumped by mark_changed(); to_public_dict output is cached per version
+    _state_version: int = PrivateAttr(default=0)
+    _public_cache: Optional[Tuple[int, dict]] = PrivateAttr(default=None)
+
+    # Seat-ordered indexes of the players in the hand (ACTIVE or ALL_IN) and of
+    # those who can act (ACTIVE). Rebuilt by reindex_players(), kept current by set_status()
+    _in_hand: Dict[str, Player] = PrivateAttr(default_factory=dict)
+    _to_act: Dict[str, Player] = PrivateAttr(default_factory=dict)
+
+    @property
+    def state_version(self) -> int:
+        return self._state_version
+
+    def mark_changed(self):
+        """Record that the state changed, so cached output is rebuilt on next use"""
+        self._state_version += 1
+
+    def reindex_players(self):
+        """Rebuild the status indexes; call after setting player statuses directly"""
+        players = self.players
+        active, all_in = PlayerStatus.ACTIVE, PlayerStatus.ALL_IN
+        in_hand = {}
+        to_act = {}
+        for pid in self.player_order:
+            player = players[pid]
+            status = player.status
+            if status is active:
+                in_hand[pid] = to_act[pid] = player
+            elif status is all_in:
+                in_hand[pid] = player
+        self._in_hand = in_hand
+        self._to_act = to_act
+
+    def set_status(self, player: Player, status: PlayerStatus):
+        """Change a player's status and update the status indexes to match"""
+        player.status = status
+        pid = player.player_id
+        if status is not PlayerStatus.ACTIVE:
+            self._to_act.pop(pid, None)
+        if status not in IN_HAND_STATUSES:
+            self._in_hand.pop(pid, None)
+        elif pid not in self._in_hand or (status is PlayerStatus.ACTIVE and pid not in self._to_act):
+            self.reindex_players()  # Rejoining an index, rebuild to keep seat order
+
     def get_active_players(self) -> List[Player]:
         """Get players still in the hand"""
-        return [
-            self.players[pid] for pid in self.player_order
-            if self.players[pid].status in [PlayerStatus.ACTIVE, PlayerStatus.ALL_IN]
-        ]
+        return list(self._in_hand.values())
 
     def get_players_to_act(self) -> List[Player]:
         """Get players who can still act (not folded, not all-in)"""
-        return [
-            self.players[pid] for pid in self.player_order
-            if self.players[pid].status == PlayerStatus.ACTIVE
-        ]
+        return list(self._to_act.values())
 
     def get_total_pot(self) -> int:
         """Get total chips in all pots"""
-        return sum(pot.amount for pot in self.pots)
+        return self._total_pot
+
+    def add_to_pot(self, amount: int):
+        """Add chips to the main pot"""
+        self.pots[0].amount += amount
+        self._total_pot += amount
+
+    def reset_pots(self):
+        """Start the hand with a single empty main pot"""
+        self.pots = [PotInfo(amount=0, eligible_players=[])]
+        self._total_pot = 0
+
+    def empty_pots(self):
+        """Mark every pot as paid out"""
+        for pot in self.pots:
+            pot.amount = 0
+        self._total_pot = 0
+
+    def record_action(self, row: Tuple):
+        """Append a row to action_history (see ACTION_HISTORY_FIELDS)"""
+        self.action_history.append(row)
+        self._recent_actions.append(dict(zip(ACTION_HISTORY_FIELDS, row)))
+
+    def clear_action_history(self):
+        """Start an empty action history for a new hand"""
+        self.action_history = []
+        self._recent_actions.clear()
+
+    def get_action_history(self, last: Optional[int] = None) -> List[Dict]:
+        """Get action history as dicts, optionally only the last N actions"""
+        rows = self.action_history[-last:] if last else self.action_history
+        return [dict(zip(ACTION_HISTORY_FIELDS, row)) for row in rows]
 
     def to_public_dict(self) -> dict:
-        """Return game state with hidden hole cards"""
+        """
+        Return game state with hidden hole cards.
+        Built once per state version; callers get their own top-level dict but
+        share the nested values, which must be treated as read-only.
+        """
+        cached = self._public_cache
+        if cached is None or cached[0] != self._state_version:
+            cached = self._public_cache = (self._state_version, self._build_public_dict())
+        return dict(cached[1])
+
+    def _build_public_dict(self) -> dict:
         return {
-            "game_id": self.game_id,
+            "game_id": f"{self.game_id:032x}",
             "table_id": self.table_id,
             "hand_number": self.hand_number,
             "phase": self.phase.value,
             "betting_round": self.betting_round.value,
             "players": {pid: p.to_public_dict() for pid, p in self.players.items()},
             "player_order": self.player_order,
-            "community_cards": [c.to_dict() for c in self.community_cards],
+            "community_cards": [CARD_JSON[c.index] for c in self.community_cards],
             "pots": [{"amount": p.amount, "eligible_players": p.eligible_players} for p in self.pots],
             "current_player_id": self.current_player_id,
             "dealer_position": self.dealer_position,
@@ -108,14 +217,15 @@ class GameState(BaseModel):
             "current_bet": self.current_bet,
             "min_raise": self.min_raise,
             "total_pot": self.get_total_pot(),
-            "action_history": self.action_history[-10:],  # Last 10 actions
+            "action_history": list(self._recent_actions),
             "hand_winners": self.hand_winners
         }
 
     def to_player_dict(self, player_id: str) -> dict:
         """Return game state for a specific player (shows their cards)"""
         data = self.to_public_dict()
-        if player_id in self.players:
-            data["players"][player_id] = self.players[player_id].to_private_dict()
-            data["your_hole_cards"] = [c.to_dict() for c in self.players[player_id].hole_cards]
+        player = self.players.get(player_id)
+        if player is not None:
+            data["players"] = {**data["players"], player_id: player.to_private_dict()}
+            data["your_hole_cards"] = player.hole_cards_json()
         return data
\ No newline at end of file
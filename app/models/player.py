@@ -1,7 +1,7 @@
-from pydantic import BaseModel, Field
+from dataclasses import dataclass, field
 from typing import List, Optional
 from enum import Enum
-from .cards import Card
+from .cards import Card, CARD_JSON
 
 class PlayerStatus(str, Enum):
     WAITING = "waiting"      # Registered but not in game
@@ -11,12 +11,20 @@ class PlayerStatus(str, Enum):
     ELIMINATED = "eliminated" # Out of tournament
     DISCONNECTED = "disconnected"
 
-class Player(BaseModel):
-    """Player state model"""
+# Statuses of players still contesting the current hand
+IN_HAND_STATUSES = frozenset((PlayerStatus.ACTIVE, PlayerStatus.ALL_IN))
+
+@dataclass(slots=True)
+class Player:
+    """
+    Player state model.
+    A plain slots dataclass rather than a pydantic model: its fields are
+    written on every action and only leave the engine via the to_*_dict methods.
+    """
     player_id: str
     username: str
     chips: int = 0
-    hole_cards: List[Card] = Field(default_factory=list)
+    hole_cards: List[Card] = field(default_factory=list)
     current_bet: int = 0      # Bet in current betting round
     total_bet: int = 0        # Total bet in current hand
     status: PlayerStatus = PlayerStatus.WAITING
@@ -26,10 +34,16 @@ class Player(BaseModel):
     is_big_blind: bool = False
     has_acted: bool = False   # Has acted this betting round
     last_action: Optional[str] = None
+    # Last to_public_dict output and the field values it was built from
+    _public_key: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+    _public_dict: Optional[dict] = field(default=None, init=False, repr=False, compare=False)
+    # JSON form of hole_cards, built on first use after the hand is dealt
+    _hole_cards_json: Optional[list] = field(default=None, init=False, repr=False, compare=False)
 
     def reset_for_hand(self):
         """Reset player state for a new hand"""
         self.hole_cards = []
+        self._hole_cards_json = None
         self.current_bet = 0
         self.total_bet = 0
         self.has_acted = False
@@ -48,8 +62,16 @@ class Player(BaseModel):
         self.has_acted = False
 
     def to_public_dict(self) -> dict:
-        """Return public information (hide hole cards)"""
-        return {
+        """
+        Return public information (hide hole cards).
+        The dict is reused until one of its fields changes, so it must be treated as read-only.
+        """
+        key = (self.chips, self.current_bet, self.total_bet, self.status, self.seat_position,
+               self.is_dealer, self.is_small_blind, self.is_big_blind, self.last_action)
+        if key == self._public_key:
+            return self._public_dict
+        self._public_key = key
+        self._public_dict = {
             "player_id": self.player_id,
             "username": self.username,
             "chips": self.chips,
@@ -63,9 +85,17 @@ class Player(BaseModel):
             "last_action": self.last_action,
             "hole_cards": []  # Hidden
         }
+        return self._public_dict
 
     def to_private_dict(self) -> dict:
         """Return full information including hole cards"""
-        data = self.to_public_dict()
-        data["hole_cards"] = [card.to_dict() for card in self.hole_cards]
-        return data
\ No newline at end of file
+        data = dict(self.to_public_dict())
+        data["hole_cards"] = self.hole_cards_json()
+        return data
+
+    def hole_cards_json(self) -> list:
+        """Hole cards as JSON dicts; the list is shared until the next hand, so read-only"""
+        cards = self._hole_cards_json
+        if cards is None:
+            cards = self._hole_cards_json = [CARD_JSON[card.index] for card in self.hole_cards]
+        return cards
\ No newline at end of file
@@ -2,21 +2,25 @@ from fastapi import APIRouter, WebSocket, WebSocketDisconnect, HTTPException, De
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
 from typing import Optional
 import secrets
+import asyncio
 
 from ..config import server_settings
 from ..managers.tournament import tournament_manager
-from ..managers.connection import connection_manager
+from ..managers.connection import connection_manager, encode_message
 from ..models.api import AdminLoginRequest, AdminCommandRequest
 
 router = APIRouter(prefix="/admin", tags=["Admin API"])
 security = HTTPBasic()
 
+# Admin password as bytes, encoded once instead of on every request
+_ADMIN_PASSWORD = server_settings.admin_password.encode("utf-8")
+
 
 def verify_admin(credentials: HTTPBasicCredentials = Depends(security)):
     """Verify admin credentials"""
     correct_password = secrets.compare_digest(
         credentials.password.encode("utf-8"),
-        server_settings.admin_password.encode("utf-8")
+        _ADMIN_PASSWORD
     )
     if not correct_password:
         raise HTTPException(
@@ -93,7 +97,8 @@ async def remove_player(player_id: str, _: bool = Depends(verify_admin)):
     api_key = player_info.get("api_key")
     if api_key:
         tournament_manager.api_keys.pop(api_key, None)
-    tournament_manager.player_table_map.pop(player_id, None)
+    tournament_manager.usernames_lower.pop(player_info["username"].lower(), None)
+    tournament_manager.unseat_player(player_id)
 
     return {"success": True, "message": f"Player {player_info['username']} removed"}
 
@@ -106,8 +111,10 @@ async def broadcast_message(message: str, _: bool = Depends(verify_admin)):
         "data": {"message": message}
     }
 
-    await connection_manager.broadcast_to_viewers(broadcast_data)
-    await connection_manager.send_to_all_players(broadcast_data)
+    await asyncio.gather(
+        connection_manager.broadcast_to_viewers(broadcast_data),
+        connection_manager.send_to_all_players(broadcast_data)
+    )
 
     return {"success": True, "message": "Broadcast sent"}
 
@@ -119,10 +126,10 @@ async def admin_websocket(websocket: WebSocket):
 
     try:
         # Send initial status
-        await websocket.send_json({
+        await websocket.send_bytes(encode_message({
             "type": "status",
             "data": tournament_manager.get_tournament_status()
-        })
+        }))
 
         while True:
             data = await websocket.receive_text()
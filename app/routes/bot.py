@@ -1,14 +1,22 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, HTTPException, Header, Depends
+from fastapi.responses import ORJSONResponse
 from typing import Optional
-import json
+from functools import partial
+
+import orjson
 
 from ..models.api import RegisterBotRequest, RegisterBotResponse, BotActionRequest, BotActionResponse
 from ..models.game import ActionType
 from ..managers.tournament import tournament_manager
-from ..managers.connection import connection_manager
+from ..managers.connection import (
+    connection_manager, encode_message, encode_msgpack, msgpack, ENCODING_JSON, ENCODING_MSGPACK
+)
 
 router = APIRouter(prefix="/bot", tags=["Bot API"])
 
+# Action types by their wire value, looked up instead of calling ActionType(...) per message
+_ACTION_TYPES = {action.value: action for action in ActionType}
+
 
 async def verify_api_key(x_api_key: str = Header(...)) -> str:
     """Verify API key and return player_id"""
@@ -29,13 +37,14 @@ async def register_bot(request: RegisterBotRequest):
         team_name=request.team_name
     )
 
+    # Fields are built by the server; FastAPI still checks them against response_model
     if not result["success"]:
-        return RegisterBotResponse(
+        return RegisterBotResponse.model_construct(
             success=False,
             message=result["message"]
         )
 
-    return RegisterBotResponse(
+    return RegisterBotResponse.model_construct(
         success=True,
         player_id=result["player_id"],
         api_key=result["api_key"],
@@ -44,7 +53,7 @@ async def register_bot(request: RegisterBotRequest):
     )
 
 
-@router.post("/action", response_model=BotActionResponse)
+@router.post("/action", response_model=None, responses={200: {"model": BotActionResponse}})
 async def submit_action(
     request: BotActionRequest,
     player_id: str = Depends(verify_api_key)
@@ -61,12 +70,14 @@ async def submit_action(
 
     game_state = tournament_manager.get_player_game_state(player_id)
 
-    return BotActionResponse(
-        success=result["success"],
-        message=result["message"],
-        action_accepted=result.get("action"),
-        game_state=game_state
-    )
+    # Hot path: encode the BotActionResponse fields directly rather than
+    # building and re-validating the model on every action
+    return ORJSONResponse({
+        "success": result["success"],
+        "message": result["message"],
+        "action_accepted": result.get("action"),
+        "game_state": game_state
+    })
 
 
 @router.get("/state")
@@ -109,40 +120,73 @@ async def get_valid_actions(player_id: str = Depends(verify_api_key)):
 
 
 @router.websocket("/ws/{player_id}")
-async def bot_websocket(websocket: WebSocket, player_id: str):
+async def bot_websocket(websocket: WebSocket, player_id: str, encoding: str = ENCODING_JSON):
     """
     WebSocket connection for real-time game updates.
-    Bot should send actions as JSON: {"action_type": "call", "amount": null}
+    Bot should send actions as JSON, in text or binary frames:
+    {"type": "action", "data": {"action_type": "call", "amount": null}}
+    Every message from the server arrives as a binary frame of UTF-8 JSON, never
+    a text frame: bots that only handle text frames will not see any messages.
+    Connect with ?encoding=msgpack to send and receive msgpack binary frames instead;
+    text frames from the bot are still read as JSON.
     """
     # Verify player exists
     if player_id not in tournament_manager.registered_players:
         await websocket.close(code=4001, reason="Player not registered")
         return
 
-    await connection_manager.connect_player(websocket, player_id)
+    # Binary frames are decoded in the bot's encoding; text frames are always JSON
+    if encoding == ENCODING_MSGPACK and msgpack is not None:
+        encode, decode_bytes = encode_msgpack, partial(msgpack.unpackb, raw=False)
+        invalid_bytes = "Invalid msgpack"
+    elif encoding == ENCODING_JSON:
+        encode, decode_bytes = encode_message, orjson.loads
+        invalid_bytes = "Invalid JSON"
+    else:
+        await websocket.close(code=4002, reason=f"Unsupported encoding: {encoding}")
+        return
+
+    await connection_manager.connect_player(websocket, player_id, encoding)
 
     try:
         # Send initial state
         game_state = tournament_manager.get_player_game_state(player_id)
-        await websocket.send_json({
+        await websocket.send_bytes(encode({
             "type": "connected",
             "data": {
                 "player_id": player_id,
                 "tournament_status": tournament_manager.status.value,
                 "game_state": game_state
             }
-        })
+        }))
 
         while True:
-            # Receive action from bot
-            data = await websocket.receive_text()
+            # Receive action from bot, in a text or a binary frame
+            frame = await websocket.receive()
+            if frame["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(frame.get("code", 1000))
+
+            text = frame.get("text")
+            try:
+                if text is not None:
+                    message = orjson.loads(text)
+                else:
+                    message = decode_bytes(frame.get("bytes") or b"")
+            except ValueError:  # orjson's and msgpack's decode errors are ValueErrors
+                await websocket.send_bytes(encode({
+                    "type": "error",
+                    "data": {"message": "Invalid JSON" if text is not None else invalid_bytes}
+                }))
+                continue
             
             try:
-                message = json.loads(data)
-                
                 if message.get("type") == "action":
                     action_data = message.get("data", {})
-                    action_type = ActionType(action_data.get("action_type"))
+                    raw_type = action_data.get("action_type")
+                    try:
+                        action_type = _ACTION_TYPES[raw_type]
+                    except (KeyError, TypeError):  # Unknown or unhashable value
+                        raise ValueError(f"{raw_type!r} is not a valid ActionType") from None
                     amount = action_data.get("amount")
 
                     result = await tournament_manager.process_player_action(
@@ -151,28 +195,23 @@ async def bot_websocket(websocket: WebSocket, player_id: str):
                         amount=amount
                     )
 
-                    await websocket.send_json({
+                    await websocket.send_bytes(encode({
                         "type": "action_result",
                         "data": result
-                    })
+                    }))
 
                 elif message.get("type") == "ping":
-                    await websocket.send_json({"type": "pong"})
+                    await websocket.send_bytes(encode({"type": "pong"}))
 
-            except json.JSONDecodeError:
-                await websocket.send_json({
-                    "type": "error",
-                    "data": {"message": "Invalid JSON"}
-                })
             except ValueError as e:
-                await websocket.send_json({
+                await websocket.send_bytes(encode({
                     "type": "error",
                     "data": {"message": str(e)}
-                })
+                }))
 
     except WebSocketDisconnect:
         print(f"[Bot WS] Player {player_id} disconnected")
     except Exception as e:
         print(f"[Bot WS] Error for player {player_id}: {e}")
     finally:
-        await connection_manager.disconnect_player(player_id)
\ No newline at end of file
+        await connection_manager.disconnect_player(player_id, websocket)
\ No newline at end of file
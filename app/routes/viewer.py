@@ -1,12 +1,24 @@
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, Response
 
 from ..managers.tournament import tournament_manager
-from ..managers.connection import connection_manager
+from ..managers.connection import connection_manager, encode_message
 
 router = APIRouter(prefix="/viewer", tags=["Viewer API"])
 
+# Encoded response bodies by endpoint, with the snapshot they were encoded from.
+# Spectators poll the same snapshots, so each one is encoded once for all of them.
+_encoded_responses = {}
+
+
+def _snapshot_response(name: str, snapshot: object, version: int, build) -> Response:
+    """Serve the encoded body of build(), re-encoding only when the snapshot object or version changes"""
+    cached = _encoded_responses.get(name)
+    if cached is None or cached[0] is not snapshot or cached[1] != version:
+        cached = _encoded_responses[name] = (snapshot, version, encode_message(build()))
+    return Response(content=cached[2], media_type="application/json")
+
 
 @router.get("/status")
 async def get_public_status():
@@ -28,36 +40,20 @@ async def get_public_status():
 @router.get("/tables")
 async def get_public_tables():
     """Get public table states (hole cards hidden)"""
-    return {
-        "tables": tournament_manager.get_table_states()
-    }
+    tables = tournament_manager.get_table_states()
+    return _snapshot_response("tables", tables, 0, lambda: {"tables": tables})
 
 
 @router.get("/leaderboard")
 async def get_leaderboard():
     """Get current chip leaderboard"""
-    players = tournament_manager.get_player_list()
-    
-    # Sort by chips (descending)
-    leaderboard = sorted(
-        [p for p in players if p.get("chips", 0) > 0],
-        key=lambda x: x.get("chips", 0),
-        reverse=True
+    leaderboard = tournament_manager.get_leaderboard()
+    eliminations = tournament_manager.eliminations
+    return _snapshot_response(
+        "leaderboard", leaderboard, len(eliminations),
+        lambda: {"leaderboard": leaderboard, "eliminations": eliminations[-20:]}
     )
 
-    return {
-        "leaderboard": [
-            {
-                "position": i + 1,
-                "username": p["username"],
-                "chips": p.get("chips", 0),
-                "table_id": p.get("table_id")
-            }
-            for i, p in enumerate(leaderboard)
-        ],
-        "eliminations": tournament_manager.eliminations[-20:]
-    }
-
 
 @router.websocket("/ws")
 async def viewer_websocket(websocket: WebSocket):
@@ -66,20 +62,18 @@ async def viewer_websocket(websocket: WebSocket):
 
     try:
         # Send initial state
-        await websocket.send_json({
+        await websocket.send_bytes(encode_message({
             "type": "connected",
             "data": {
                 "tournament_status": tournament_manager.get_tournament_status(),
                 "tables": tournament_manager.get_table_states()
             }
-        })
-
-        while True:
-            # Keep connection alive, viewers don't send data typically
-            data = await websocket.receive_text()
-            
-            if data == "ping":
-                await websocket.send_json({"type": "pong"})
+        }))
+
+        # Viewers don't send data; keepalive is the shared heartbeat, so this
+        # only waits for the disconnect
+        async for _ in websocket.iter_text():
+            pass
 
     except WebSocketDisconnect:
         pass
@@ -8,6 +8,11 @@ import aiohttp
 import json
 from typing import Optional, Dict, Any
 
+try:
+    import msgpack  # Optional: smaller, faster frames than JSON
+except ImportError:
+    msgpack = None
+
 class PokerBot:
     def __init__(self, server_url: str, username: str):
         self.server_url = server_url.rstrip('/')
@@ -17,25 +22,26 @@ class PokerBot:
         self.ws: Optional[aiohttp.ClientWebSocketResponse] = None
         self.session: Optional[aiohttp.ClientSession] = None
         self.running = False
+        # Ask the server for msgpack frames when msgpack is installed
+        self.encoding = "msgpack" if msgpack is not None else "json"
 
     async def register(self) -> bool:
         """Register the bot with the tournament server"""
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                f"{self.server_url}/bot/register",
-                json={"username": self.username}
-            ) as resp:
-                data = await resp.json()
-                
-                if data.get("success"):
-                    self.player_id = data["player_id"]
-                    self.api_key = data["api_key"]
-                    print(f"✅ Registered as {self.username}")
-                    print(f"   Player ID: {self.player_id}")
-                    return True
-                else:
-                    print(f"❌ Registration failed: {data.get('message')}")
-                    return False
+        async with self.session.post(
+            f"{self.server_url}/bot/register",
+            json={"username": self.username}
+        ) as resp:
+            data = await resp.json()
+            
+            if data.get("success"):
+                self.player_id = data["player_id"]
+                self.api_key = data["api_key"]
+                print(f"✅ Registered as {self.username}")
+                print(f"   Player ID: {self.player_id}")
+                return True
+            else:
+                print(f"❌ Registration failed: {data.get('message')}")
+                return False
 
     async def connect_websocket(self):
         """Connect to the game WebSocket"""
@@ -44,11 +50,10 @@ class PokerBot:
             return
 
         ws_url = self.server_url.replace("http", "ws")
-        self.session = aiohttp.ClientSession()
         
         try:
             self.ws = await self.session.ws_connect(
-                f"{ws_url}/bot/ws/{self.player_id}"
+                f"{ws_url}/bot/ws/{self.player_id}?encoding={self.encoding}"
             )
             print(f"✅ WebSocket connected")
             self.running = True
@@ -58,19 +63,20 @@ class PokerBot:
             
         except Exception as e:
             print(f"❌ WebSocket connection failed: {e}")
-        finally:
-            if self.session:
-                await self.session.close()
 
     async def _handle_messages(self):
         """Handle incoming WebSocket messages"""
         async for msg in self.ws:
-            if msg.type == aiohttp.WSMsgType.TEXT:
+            if msg.type in (aiohttp.WSMsgType.TEXT, aiohttp.WSMsgType.BINARY):
                 try:
-                    data = json.loads(msg.data)
-                    await self._process_message(data)
-                except json.JSONDecodeError:
-                    print(f"Invalid JSON: {msg.data}")
+                    if self.encoding == "msgpack":
+                        data = msgpack.unpackb(msg.data, raw=False)
+                    else:
+                        data = json.loads(msg.data)
+                except ValueError:  # Both json and msgpack raise ValueErrors
+                    print(f"Invalid message: {msg.data!r}")
+                    continue
+                await self._process_message(data)
                     
             elif msg.type == aiohttp.WSMsgType.ERROR:
                 print(f"WebSocket error: {self.ws.exception()}")
@@ -114,27 +120,31 @@ class PokerBot:
         if current_player != self.player_id:
             return
 
-        print(f"\n{'='*50}")
-        print(f"🎯 YOUR TURN!")
-        print(f"   Round: {game_state.get('betting_round')}")
-        print(f"   Pot: {game_state.get('total_pot')}")
-        print(f"   Current bet: {game_state.get('current_bet')}")
+        # Build the turn summary and print it in one call, not one print per line
+        lines = [
+            f"\n{'='*50}",
+            f"🎯 YOUR TURN!",
+            f"   Round: {game_state.get('betting_round')}",
+            f"   Pot: {game_state.get('total_pot')}",
+            f"   Current bet: {game_state.get('current_bet')}",
+        ]
         
         # Show our cards
         our_cards = game_state.get("your_hole_cards", [])
         if our_cards:
             cards_str = " ".join([f"{c['rank']}{c['suit']}" for c in our_cards])
-            print(f"   Your cards: {cards_str}")
+            lines.append(f"   Your cards: {cards_str}")
 
         # Show community cards
         community = game_state.get("community_cards", [])
         if community:
             comm_str = " ".join([f"{c['rank']}{c['suit']}" for c in community])
-            print(f"   Community: {comm_str}")
+            lines.append(f"   Community: {comm_str}")
 
         # Get valid actions
         valid_actions = game_state.get("valid_actions", [])
-        print(f"   Valid actions: {[a['action_type'] for a in valid_actions]}")
+        lines.append(f"   Valid actions: {[a['action_type'] for a in valid_actions]}")
+        print("\n".join(lines))
 
         # Decide and send action
         action = self.decide_action(game_state, valid_actions)
@@ -172,18 +182,26 @@ class PokerBot:
             }
         }
 
-        await self.ws.send_json(message)
+        if self.encoding == "msgpack":
+            await self.ws.send_bytes(msgpack.packb(message))
+        else:
+            await self.ws.send_json(message)
         print(f"📤 Sent action: {action_type}" + (f" ({amount})" if amount else ""))
 
     async def run(self):
         """Main bot loop"""
-        if not await self.register():
-            return
+        # One session for registering and the WebSocket, so its connection and DNS are reused
+        self.session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(ttl_dns_cache=300))
+        try:
+            if not await self.register():
+                return
 
-        print(f"\n⏳ Waiting for tournament to start...")
-        print(f"   Connect to the admin panel to start the tournament")
-        
-        await self.connect_websocket()
+            print(f"\n⏳ Waiting for tournament to start...")
+            print(f"   Connect to the admin panel to start the tournament")
+            
+            await self.connect_websocket()
+        finally:
+            await self.session.close()
 
 
 # Run the bot
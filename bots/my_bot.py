@@ -5,50 +5,163 @@ My First Poker Bot
 import asyncio
 import aiohttp
 import json
+from urllib.parse import urlsplit, urlunsplit
+
+# orjson parses and writes JSON several times faster; plain json works too
+try:
+    import orjson
+    json_loads = orjson.loads
+    def json_dumps(obj):
+        return orjson.dumps(obj).decode()
+except ImportError:
+    json_loads, json_dumps = json.loads, json.dumps
+
+# msgpack frames are smaller and faster to parse; without it the bot speaks JSON
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Actions without an amount, shared instead of built on every turn
+CALL = {"action_type": "call", "amount": None}
+CHECK = {"action_type": "check", "amount": None}
+FOLD = {"action_type": "fold", "amount": None}
+
+# WebSocket frames that carry a message
+DATA_FRAMES = (aiohttp.WSMsgType.TEXT, aiohttp.WSMsgType.BINARY)
+
+# Printable form of each of the 52 cards, keyed by the server's (rank, suit)
+_CARD_STR = {(r, s): r + s for r in "23456789TJQKA" for s in "cdhs"}
 
 class MyPokerBot:
+    # Fixed attributes: smaller instances and faster self.* lookups.
+    # Add a name here for anything your strategy stores on self
+    # (subclasses without their own __slots__ can set attributes freely)
+    __slots__ = (
+        "server_url", "ws_base", "ws_url", "bot_name", "player_id", "api_key", "use_msgpack",
+        "encoded_actions", "text_needles", "binary_needles"
+    )
+
     def __init__(self, server_url, bot_name):
-        self.server_url = server_url
+        self.server_url = server_url.rstrip("/")
+        # The same server over WebSocket: http -> ws, https -> wss
+        parts = urlsplit(self.server_url)
+        scheme = "wss" if parts.scheme == "https" else "ws"
+        self.ws_base = urlunsplit((scheme, parts.netloc, parts.path, "", ""))
+        self.ws_url = None  # Our game socket, known once registered
         self.bot_name = bot_name
         self.player_id = None
         self.api_key = None
+        self.use_msgpack = False  # Set once the server answers in msgpack
+        self.encoded_actions = {}  # (action type, msgpack?) -> message, for actions without an amount
     
-    async def register(self):
+    async def register(self, session):
         """Register the bot with the tournament"""
         print(f"Registering bot '{self.bot_name}'...")
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                f"{self.server_url}/bot/register",
-                json={"username": self.bot_name}
-            ) as response:
-                data = await response.json()
-                
-                if data.get("success"):
-                    self.player_id = data["player_id"]
-                    self.api_key = data["api_key"]
-                    print(f"✅ Registration successful!")
-                    print(f"   Player ID: {self.player_id}")
-                    return True
-                else:
-                    print(f"❌ Registration failed: {data.get('message')}")
-                    return False
+        async with session.post(
+            f"{self.server_url}/bot/register",
+            json={"username": self.bot_name}
+        ) as response:
+            data = await response.json()
+            
+            if data.get("success"):
+                self.player_id = data["player_id"]
+                self.api_key = data["api_key"]
+                self.ws_url = f"{self.ws_base}/bot/ws/{self.player_id}"
+                if msgpack is not None:
+                    self.ws_url += "?encoding=msgpack"
+                print(f"✅ Registration successful!")
+                print(f"   Player ID: {self.player_id}")
+                return True
+            else:
+                print(f"❌ Registration failed: {data.get('message')}")
+                return False
     
-    async def connect_and_play(self):
+    async def connect_and_play(self, session):
         """Connect to game and start playing"""
-        ws_url = self.server_url.replace("http", "ws")
+        # Byte patterns of a game state, and of one where it's our turn, as the
+        # server writes them; used to skip other players' turns without parsing
+        state, our_turn = '"type":"game_state"', f'"current_player_id":"{self.player_id}"'
+        self.text_needles = [(state, our_turn)]
+        self.binary_needles = [(state.encode(), our_turn.encode())]
+        if msgpack is not None:
+            self.binary_needles.append((
+                msgpack.packb("type") + msgpack.packb("game_state"),
+                msgpack.packb("current_player_id") + msgpack.packb(self.player_id)
+            ))
         
-        async with aiohttp.ClientSession() as session:
-            async with session.ws_connect(f"{ws_url}/bot/ws/{self.player_id}") as ws:
-                print("✅ Connected to game server!")
-                print("⏳ Waiting for tournament to start...")
-                
-                async for msg in ws:
-                    if msg.type == aiohttp.WSMsgType.TEXT:
-                        await self.handle_message(ws, json.loads(msg.data))
-                    elif msg.type == aiohttp.WSMsgType.ERROR:
-                        print(f"❌ Connection error")
+        # heartbeat: aiohttp pings the server every 20s so a dead connection is noticed
+        # max_msg_size: game messages are small, so refuse anything over 1 MiB
+        async with session.ws_connect(self.ws_url, autoping=True, heartbeat=20, max_msg_size=2**20) as ws:
+            print("✅ Connected to game server!")
+            print("⏳ Waiting for tournament to start...")
+            
+            # A reader task queues frames as they arrive, so each time round we
+            # can take everything waiting and act only on the newest game state
+            inbox = asyncio.Queue()
+            reader = asyncio.create_task(self.read_frames(ws, inbox))
+            try:
+                while True:
+                    frames = [await inbox.get()]
+                    while not inbox.empty():
+                        frames.append(inbox.get_nowait())
+                    if not await self.handle_frames(ws, frames):
                         break
+            finally:
+                reader.cancel()
+    
+    async def read_frames(self, ws, inbox):
+        """Move frames from the socket into inbox; None marks the end"""
+        try:
+            async for msg in ws:
+                inbox.put_nowait(msg)
+        finally:
+            inbox.put_nowait(None)
+    
+    async def handle_frames(self, ws, frames):
+        """Handle frames in order, skipping game states a later one replaces; False when done"""
+        states = [i for i, msg in enumerate(frames)
+                  if msg is not None and msg.type in DATA_FRAMES and self.is_game_state(msg.data)]
+        stale = set(states[:-1])
+        
+        for i, msg in enumerate(frames):
+            if msg is None:
+                return False
+            if i in stale:
+                continue  # An older game state; the newest one is further on
+            if msg.type in DATA_FRAMES and self.is_others_turn(msg.data):
+                continue  # handle_message would ignore it anyway
+            if msg.type == aiohttp.WSMsgType.TEXT:
+                await self.handle_message(ws, json_loads(msg.data))
+            elif msg.type == aiohttp.WSMsgType.BINARY:
+                await self.handle_message(ws, self.decode_binary(msg.data))
+            elif msg.type == aiohttp.WSMsgType.ERROR:
+                print(f"❌ Connection error")
+                return False
+        return True
+    
+    def is_game_state(self, data):
+        """Whether a raw frame is a game state"""
+        needles = self.text_needles if isinstance(data, str) else self.binary_needles
+        return any(state in data for state, _ in needles)
+    
+    def is_others_turn(self, data):
+        """Whether a raw frame is a game state where it isn't our turn"""
+        needles = self.text_needles if isinstance(data, str) else self.binary_needles
+        return any(state in data and our_turn not in data for state, our_turn in needles)
+    
+    def decode_binary(self, data):
+        """Binary frames are msgpack if we asked for it and the server supports it, else JSON"""
+        if msgpack is not None:
+            try:
+                message = msgpack.unpackb(data, raw=False)
+                if isinstance(message, dict):
+                    self.use_msgpack = True
+                    return message
+            except ValueError:
+                pass
+        return json_loads(data)
     
     async def handle_message(self, ws, message):
         """Handle incoming messages from server"""
@@ -66,59 +179,76 @@ class MyPokerBot:
     
     async def take_action(self, ws, game_state):
         """Decide and send our action"""
-        print("\n" + "="*50)
-        print("🎯 YOUR TURN!")
-        
-        # Show our cards
-        our_cards = game_state.get("your_hole_cards", [])
-        cards_str = " ".join([f"{c['rank']}{c['suit']}" for c in our_cards])
-        print(f"   Your cards: {cards_str}")
-        
-        # Show game info
-        print(f"   Pot: {game_state.get('total_pot')}")
-        print(f"   To call: {game_state.get('current_bet')}")
-        
-        # Get valid actions
-        valid_actions = game_state.get("valid_actions", [])
-        action_types = [a["action_type"] for a in valid_actions]
-        print(f"   Options: {action_types}")
+        # Get valid actions, keyed by action type for quick "can I ...?" checks
+        options = {a["action_type"]: a for a in game_state.get("valid_actions", [])}
         
         # DECIDE WHAT TO DO - This is where your strategy goes!
-        action = self.decide_action(game_state, valid_actions)
+        action = self.decide_action(game_state, options)
+        
+        # Send the action; the simple ones are encoded once and reused
+        key = (action["action_type"], self.use_msgpack)
+        payload = self.encoded_actions.get(key) if action.get("amount") is None else None
+        if payload is None:
+            message = {"type": "action", "data": action}
+            if self.use_msgpack:
+                payload = msgpack.packb(message, use_bin_type=True)
+            else:
+                payload = json_dumps(message)
+            if action.get("amount") is None:
+                self.encoded_actions[key] = payload
+        if self.use_msgpack:
+            await ws.send_bytes(payload)
+        else:
+            await ws.send_str(payload)
         
-        # Send the action
-        await ws.send_json({
-            "type": "action",
-            "data": action
-        })
-        print(f"   ➡️ Action: {action['action_type']}")
+        # Show the turn once the action is on its way, in a single write
+        our_cards = game_state.get("your_hole_cards", [])
+        cards_str = " ".join([_CARD_STR[c["rank"], c["suit"]] for c in our_cards])
+        print("\n".join([
+            "\n" + "="*50,
+            "🎯 YOUR TURN!",
+            f"   Your cards: {cards_str}",
+            f"   Pot: {game_state.get('total_pot')}",
+            f"   To call: {game_state.get('current_bet')}",
+            f"   Options: {list(options)}",
+            f"   ➡️ Action: {action['action_type']}",
+        ]))
     
-    def decide_action(self, game_state, valid_actions):
+    def decide_action(self, game_state, options):
         """
         YOUR STRATEGY GOES HERE!
         
+        options maps each action you may take ("fold", "check", "call", "bet",
+        "raise", "all_in") to its entry, which has min_amount and max_amount.
+        
         This simple strategy:
         - Calls if possible
         - Checks if can't call
         - Folds as last resort
         """
-        action_types = [a["action_type"] for a in valid_actions]
-        
         # Try to call
-        if "call" in action_types:
-            return {"action_type": "call", "amount": None}
+        if "call" in options:
+            return CALL
         
         # Try to check
-        if "check" in action_types:
-            return {"action_type": "check", "amount": None}
+        if "check" in options:
+            return CHECK
         
         # Fold if nothing else
-        return {"action_type": "fold", "amount": None}
+        return FOLD
     
     async def run(self):
         """Main function to run the bot"""
-        if await self.register():
-            await self.connect_and_play()
+        # One session for everything, so registering and playing share its connections.
+        # DNS answers are cached for 5 minutes and idle connections kept for 75s,
+        # so reconnecting after a drop skips the lookup and handshake
+        connector = aiohttp.TCPConnector(
+            limit=0, limit_per_host=8, ttl_dns_cache=300,
+            enable_cleanup_closed=True, keepalive_timeout=75
+        )
+        async with aiohttp.ClientSession(connector=connector) as session:
+            if await self.register(session):
+                await self.connect_and_play(session)
 
 
 # RUN THE BOT
@@ -3,30 +3,40 @@
 Application runner script
 """
 
+import sys
 import uvicorn
-from app.config import server_settings
+from app.config import server_settings, BANNER
+
+# uvloop schedules the many short-lived timeout and broadcast tasks faster than
+# the stdlib loop; it is not available on Windows, so fall back there
+try:
+    import uvloop  # noqa: F401
+    EVENT_LOOP = "uvloop"
+except ImportError:
+    EVENT_LOOP = "asyncio"
+
+# httptools parses HTTP requests in C; h11 is the pure Python fallback
+try:
+    import httptools  # noqa: F401
+    HTTP_PARSER = "httptools"
+except ImportError:
+    HTTP_PARSER = "h11"
 
 if __name__ == "__main__":
-    print(f"""
-╔══════════════════════════════════════════════════════════════╗
-║                 🃏 POKER BOT TOURNAMENT 🃏                    ║
-╠══════════════════════════════════════════════════════════════╣
-║  Server starting on http://{server_settings.host}:{server_settings.port}                    ║
-║                                                              ║
-║  Endpoints:                                                  ║
-║    • Viewer:  http://localhost:{server_settings.port}/static/viewer.html    ║
-║    • Admin:   http://localhost:{server_settings.port}/static/admin.html     ║
-║    • API Docs: http://localhost:{server_settings.port}/docs                  ║
-║                                                              ║
-║  Admin Password: {server_settings.admin_password}                                 ║
-╚══════════════════════════════════════════════════════════════╝
-    """)
+    # The box only helps in a terminal; under systemd or docker log a plain line
+    if sys.stdout.isatty():
+        print(BANNER)
+    else:
+        print(f"Poker server starting on http://{server_settings.host}:{server_settings.port}")
 
     uvicorn.run(
         "app.main:app",
         host=server_settings.host,
         port=server_settings.port,
         reload=server_settings.debug,
+        loop=EVENT_LOOP,
+        http=HTTP_PARSER,
+        ws="websockets",
         log_level="info"
     )
     
\ No newline at end of file